@@ -0,0 +1,107 @@
+"""auto_parse 最坏情况耗时对比：格式探测 vs 旧版逐个 try/except 级联
+
+用法：
+    python -m benchmarks.bench_auto_parse [大小MB，默认 5]
+"""
+import ast
+import json
+import sys
+import time
+import urllib.parse
+
+from logic.converter import Converter
+from logic.parse import auto_parse, detect_format
+
+converter = Converter()
+
+
+def legacy_auto_parse(raw_text):
+    """旧版 auto_parse 的级联逻辑（修正了 yaml/xmltodict 未导入的问题），仅用于对比"""
+    import demjson3
+    import xmltodict
+    import yaml
+
+    raw_text = raw_text.strip()
+    if raw_text.count('}') > 1:
+        parts = [part + '}' for part in raw_text.split('}') if part.strip()]
+        results = []
+        for part in parts:
+            try:
+                if not part.startswith('{'):
+                    part = '{' + part
+                results.append(demjson3.decode(part))
+            except Exception:
+                continue
+        if results:
+            return results[0] if len(results) == 1 else results
+    try:
+        return demjson3.decode(raw_text)
+    except Exception:
+        pass
+    try:
+        return json.loads(raw_text)
+    except json.JSONDecodeError:
+        try:
+            return ast.literal_eval(raw_text)
+        except Exception:
+            pass
+    try:
+        return yaml.safe_load(raw_text)
+    except Exception:
+        pass
+    try:
+        return xmltodict.parse(raw_text)
+    except Exception:
+        pass
+    if ',' in raw_text and '\n' in raw_text:
+        try:
+            return converter.csv_to_json(raw_text)
+        except Exception:
+            pass
+    if '=' in raw_text:
+        try:
+            return converter.url_to_json(raw_text)
+        except Exception:
+            pass
+    parsed = dict(urllib.parse.parse_qsl(raw_text))
+    if parsed and '=' in raw_text:
+        return parsed
+    raise ValueError("无法识别输入格式")
+
+
+def make_payloads(size):
+    """生成接近指定字节数的各格式输入"""
+    rows = max(1, size // 40)
+    return {
+        "json": json.dumps([{"id": i, "name": f"user{i}", "ok": True} for i in range(rows)]),
+        "csv": "id,name,score\n" + "\n".join(f"{i},user{i},{i % 100}" for i in range(rows)),
+        "tsv": "id\tname\tscore\n" + "\n".join(f"{i}\tuser{i}\t{i % 100}" for i in range(rows)),
+        "url": "&".join(f"k{i}=v{i}" for i in range(rows)),
+    }
+
+
+def timed(func, text):
+    start = time.perf_counter()
+    try:
+        func(text)
+        ok = True
+    except Exception:
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    payloads = make_payloads(int(size_mb * 1024 * 1024))
+    print(f"{'格式':<8}{'探测结果':<22}{'新版(s)':>10}{'旧版(s)':>10}")
+    for name, text in payloads.items():
+        detection = detect_format(text)
+        new_time, new_ok = timed(auto_parse, text)
+        old_time, old_ok = timed(legacy_auto_parse, text)
+        guess = f"{detection.format} {detection.confidence:.2f}"
+        print(f"{name:<8}{guess:<22}{new_time:>9.3f}{'' if new_ok else '!'}"
+              f"{old_time:>10.3f}{'' if old_ok else '!'}")
+
+
+if __name__ == "__main__":
+    main()
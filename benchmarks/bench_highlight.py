@@ -0,0 +1,77 @@
+"""语法高亮耗时随文档大小的变化
+
+对比旧版三次扫描（字符串正则 + 数字正则 + 关键字搜索）与单次扫描的
+tokenize_highlight。有图形环境时额外测量在 Text 控件中整篇高亮与只高亮可见区域的耗时。
+
+用法：
+    python -m benchmarks.bench_highlight [最大大小MB，默认 20]
+"""
+import json
+import re
+import sys
+import time
+
+from logic.lexer import tokenize_highlight
+
+
+def legacy_scan(text):
+    """旧版 highlight_json 的扫描部分：生成同样的索引字符串，但不含 Tk 调用
+
+    旧版真正的开销在于 Tk 每次都从缓冲区开头解析 "1.0 + N chars"，这里无法体现，
+    只对比 Python 侧的扫描成本。
+    """
+    ranges = []
+    for pattern in (r'\".*?\"', r'\b\d+(\.\d+)?\b', r'true|false|null'):
+        for match in re.finditer(pattern, text, re.I):
+            ranges.append(f"1.0 + {match.start()} chars")
+            ranges.append(f"1.0 + {match.end()} chars")
+    return ranges
+
+
+def make_document(size):
+    rows = max(1, size // 90)
+    data = [{"id": i, "name": f"user{i}", "score": i * 0.5, "active": i % 2 == 0, "extra": None}
+            for i in range(rows)]
+    return json.dumps(data, indent=2)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def bench_widget(text):
+    """在 Text 控件中测量整篇与可见区域高亮，没有图形环境时返回 None"""
+    import tkinter as tk
+    from logic.comm import apply_highlight_ranges, highlight_json
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return None
+    widget = tk.Text(root)
+    widget.pack()
+    widget.insert("1.0", text)
+    root.update()
+    full = timed(lambda: apply_highlight_ranges(widget, tokenize_highlight(text)))
+    viewport = timed(highlight_json, widget)
+    root.destroy()
+    return full, viewport
+
+
+def main():
+    max_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 20
+    size = 100 * 1024
+    print(f"{'大小':>10}{'三次扫描(s)':>14}{'单次扫描(s)':>14}{'控件整篇(s)':>14}{'控件可见区(s)':>16}")
+    while size <= max_mb * 1024 * 1024:
+        text = make_document(size)
+        legacy = timed(legacy_scan, text)
+        single = timed(tokenize_highlight, text)
+        widget = bench_widget(text)
+        full, viewport = widget if widget else (float("nan"), float("nan"))
+        print(f"{len(text) / 1024 / 1024:>8.1f}MB{legacy:>14.3f}{single:>14.3f}{full:>14.3f}{viewport:>16.4f}")
+        size *= 4
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""启动耗时检查：用 python -X importtime 测量 GUI 和命令行入口的导入耗时
+
+在独立子进程中导入入口模块，汇总顶层模块的累计导入时间，
+并确认 pandas、yaml 等重量级依赖没有在启动时被导入。
+任何一项超出预算时以非零状态退出，可以直接放进 CI。
+
+用法：
+    python -m benchmarks.bench_startup [--gui-budget 秒] [--cli-budget 秒] [--runs 次数]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+# 启动时不应被导入的模块（只在对应功能第一次使用时导入）
+HEAVY_MODULES = ("pandas", "numpy", "yaml", "xmltodict", "demjson3", "jsonpath_ng", "openpyxl")
+
+# (名称, 导入语句, 默认预算秒数)
+ENTRY_POINTS = (
+    ("gui", "import main, ui.layout", 0.5),
+    ("cli", "import cli; cli.build_parser()", 0.2),
+)
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(statement):
+    """在新的解释器中执行 statement，返回 (顶层导入累计秒数, 已导入的模块集合, 自身耗时最多的模块)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=_REPO_ROOT, capture_output=True, text=True, check=True)
+    total = 0
+    modules = set()
+    slowest = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        own, cumulative = int(match.group(1)), int(match.group(2))
+        depth = len(match.group(3)) - 1
+        name = match.group(4)
+        modules.add(name)
+        slowest.append((own, name))
+        if depth == 0:
+            total += cumulative
+    slowest.sort(reverse=True)
+    return total / 1e6, modules, slowest[:5]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    for name, _, budget in ENTRY_POINTS:
+        parser.add_argument(f"--{name}-budget", type=float, default=budget, help=f"{name} 导入预算（秒）")
+    parser.add_argument("--runs", type=int, default=3, help="测量次数，取最小值以排除磁盘缓存等干扰")
+    args = parser.parse_args()
+
+    failed = False
+    for name, statement, _ in ENTRY_POINTS:
+        budget = getattr(args, f"{name}_budget")
+        samples = [measure(statement) for _ in range(args.runs)]
+        total, modules, slowest = min(samples, key=lambda sample: sample[0])
+        heavy = sorted(module for module in modules if module.split(".")[0] in HEAVY_MODULES)
+        ok = total <= budget and not heavy
+        failed = failed or not ok
+        print(f"{name:<4} {total * 1000:8.1f} ms  预算 {budget * 1000:.0f} ms  {'通过' if ok else '超出'}")
+        for own, module in slowest:
+            print(f"       {own / 1000:8.1f} ms  {module}")
+        if heavy:
+            print(f"       启动时导入了重量级依赖：{', '.join(heavy)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
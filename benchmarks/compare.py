@@ -0,0 +1,65 @@
+"""对比两次 benchmarks/run.py 的结果，找出性能回退
+
+按 (用例, 格式, 大小) 配对，比较最短耗时；新结果比基准慢超过阈值即视为回退，退出码为 1。
+
+用法：
+    python -m benchmarks.compare 基准.json 新结果.json [--threshold 0.1]
+"""
+import argparse
+import json
+import sys
+
+# 耗时太短的用例受计时误差影响大，低于该值（秒）的不判定回退
+MIN_SECONDS = 0.001
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    results = {}
+    for result in report["results"]:
+        if "min" in result:
+            results[(result["case"], result["format"], result["size"])] = result["min"]
+    return report, results
+
+
+def compare(baseline, current, threshold):
+    """返回 [(键, 基准耗时, 新耗时, 比值, 是否回退)]，只包含两边都有结果的用例"""
+    rows = []
+    for key, old in baseline.items():
+        new = current.get(key)
+        if new is None:
+            continue
+        ratio = new / old if old else float("inf")
+        regressed = ratio > 1 + threshold and new >= MIN_SECONDS
+        rows.append((key, old, new, ratio, regressed))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比两次基准测试结果")
+    parser.add_argument("baseline", help="基准结果文件")
+    parser.add_argument("current", help="新结果文件")
+    parser.add_argument("--threshold", type=float, default=0.1, help="判定为回退的变慢比例，默认 0.1（10%%）")
+    args = parser.parse_args()
+
+    old_report, baseline = load_results(args.baseline)
+    new_report, current = load_results(args.current)
+    print(f"基准：{old_report.get('commit') or '未知提交'}  新结果：{new_report.get('commit') or '未知提交'}")
+
+    rows = compare(baseline, current, args.threshold)
+    for (case, fmt, size), old, new, ratio, regressed in rows:
+        mark = "  回退" if regressed else ""
+        print(f"{case:<15}{fmt:<11}{size:>6}  {old * 1000:10.2f} ms -> {new * 1000:10.2f} ms  x{ratio:.2f}{mark}")
+
+    missing = sorted(set(baseline) - set(current))
+    if missing:
+        print(f"新结果中缺少 {len(missing)} 个用例")
+    regressions = sum(1 for row in rows if row[4])
+    if regressions:
+        print(f"{regressions} 个用例变慢超过 {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
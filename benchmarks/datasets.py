@@ -0,0 +1,137 @@
+"""基准测试用的合成数据集
+
+同样的随机种子总是生成同样的数据，保证不同提交之间的结果可以对比。
+每种输入格式都由同一批记录序列化得到，大小按目标字节数近似截取。
+"""
+import json
+import random
+
+SIZES = {
+    "1KB": 1024,
+    "1MB": 1024 * 1024,
+    "100MB": 100 * 1024 * 1024,
+}
+
+FORMATS = ("json", "ndjson", "javascript", "python", "yaml", "xml", "csv", "tsv", "url")
+
+_WORDS = ("alpha", "beta", "gamma", "delta", "北京", "上海", "json", "tool", "data", "value")
+_CITIES = ("Beijing", "Shanghai", "Shenzhen", "Hangzhou", "Chengdu")
+
+
+def make_record(rng, i):
+    return {
+        "id": i,
+        "name": f"user_{i}",
+        "email": f"user{i}@example.com",
+        "score": round(rng.uniform(0, 100), 2),
+        "active": rng.random() < 0.5,
+        "note": None if rng.random() < 0.2 else " ".join(rng.choice(_WORDS) for _ in range(3)),
+        "tags": [rng.choice(_WORDS) for _ in range(rng.randint(0, 3))],
+        "address": {"city": rng.choice(_CITIES), "zip": f"{rng.randint(100000, 999999)}"},
+    }
+
+
+def _flat(record):
+    return {
+        "id": record["id"],
+        "name": record["name"],
+        "email": record["email"],
+        "score": record["score"],
+        "active": "true" if record["active"] else "false",
+        "city": record["address"]["city"],
+    }
+
+
+def _js_value(value):
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"{key}: {_js_value(v)}" for key, v in value.items()) + ",}"
+    if isinstance(value, list):
+        return "[" + ", ".join(_js_value(v) for v in value) + "]"
+    if isinstance(value, str):
+        return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+    return json.dumps(value)
+
+
+def _yaml_scalar(value):
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, str):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def _yaml_record(record):
+    lines = []
+    for i, (key, value) in enumerate(record.items()):
+        prefix = "- " if i == 0 else "  "
+        if isinstance(value, dict):
+            lines.append(f"{prefix}{key}:")
+            lines.extend(f"    {k}: {_yaml_scalar(v)}" for k, v in value.items())
+        elif isinstance(value, list):
+            lines.append(f"{prefix}{key}: [{', '.join(_yaml_scalar(v) for v in value)}]")
+        else:
+            lines.append(f"{prefix}{key}: {_yaml_scalar(value)}")
+    return "\n".join(lines)
+
+
+def _xml_value(value):
+    if isinstance(value, dict):
+        return "".join(f"<{key}>{_xml_value(v)}</{key}>" for key, v in value.items())
+    if isinstance(value, list):
+        return "".join(f"<item>{_xml_value(v)}</item>" for v in value)
+    if value is None:
+        return ""
+    return str(value).replace("&", "&amp;").replace("<", "&lt;")
+
+
+def _delimited(records, delimiter):
+    rows = [_flat(record) for record in records]
+    lines = [delimiter.join(rows[0])] if rows else []
+    lines.extend(delimiter.join(str(v) for v in row.values()) for row in rows)
+    return "\n".join(lines)
+
+
+# 每种格式：记录列表 -> 文本
+SERIALIZERS = {
+    "json": lambda records: json.dumps(records, ensure_ascii=False),
+    "ndjson": lambda records: "\n".join(json.dumps(r, ensure_ascii=False) for r in records),
+    "javascript": lambda records: "[" + ",\n".join(_js_value(r) for r in records) + ",]",
+    "python": lambda records: repr(records),
+    "yaml": lambda records: "\n".join(_yaml_record(r) for r in records),
+    "xml": lambda records: "<root>" + "".join(f"<record>{_xml_value(r)}</record>" for r in records) + "</root>",
+    "csv": lambda records: _delimited(records, ","),
+    "tsv": lambda records: _delimited(records, "\t"),
+    "url": lambda records: "&".join(f"{k}{r['id']}={v}" for r in records
+                                    for k, v in _flat(r).items() if k != "id"),
+}
+
+
+def make_records(count, seed=0):
+    rng = random.Random(seed)
+    return [make_record(rng, i) for i in range(count)]
+
+
+def make_dataset(fmt, size, seed=0):
+    """生成指定格式、接近 size 字节（不小于一条记录）的文本
+
+    Returns:
+        str: 序列化后的数据
+    """
+    serialize = SERIALIZERS[fmt]
+    sample = serialize(make_records(20, seed))
+    per_record = max(1, len(sample.encode("utf-8")) // 20)
+    count = max(1, size // per_record)
+    return serialize(make_records(count, seed))
+
+
+def parse_size(label):
+    """"1KB" / "1MB" / "100MB" 或纯字节数"""
+    if label in SIZES:
+        return SIZES[label]
+    units = {"KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+    for unit, factor in units.items():
+        if label.upper().endswith(unit):
+            return int(float(label[:-len(unit)]) * factor)
+    return int(label)
@@ -0,0 +1,344 @@
+"""可复现的基准测试套件：解析、格式化、高亮、树形视图和数据转换
+
+每个用例在 1KB / 1MB / 100MB 的合成数据集上运行（见 benchmarks/datasets.py），
+结果连同提交号、Python 版本等信息保存为 JSON，用 benchmarks/compare.py 对比两次结果。
+Tk 相关用例需要图形环境：没有 DISPLAY 时会尝试启动 Xvfb 虚拟显示，仍然失败则跳过并记录原因。
+
+用法：
+    python -m benchmarks.run [--sizes 1KB,1MB,100MB] [--formats json,csv] [--cases parse,format]
+                             [--runs 3] [--full] [-o 结果.json]
+"""
+import argparse
+import datetime
+import gc
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.datasets import FORMATS, SIZES, make_dataset, parse_size
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(_REPO_ROOT, "benchmarks", "results")
+
+# 纯 Python 解析器（demjson3、ast、yaml、xmltodict）在 100MB 上要跑很久，默认只测到该大小，--full 取消限制
+SLOW_FORMATS = ("javascript", "python", "yaml", "xml")
+SLOW_FORMAT_MAX_SIZE = SIZES["1MB"]
+# Tk 控件用例默认的最大数据量，一次性插入 100MB 正是分块渲染要避免的情况
+TK_MAX_SIZE = SIZES["1MB"]
+
+# 字段名与 benchmarks/datasets.py 的记录一致
+TRANSFORM_STEPS = [
+    {"type": "filter", "params": {"condition": {"active": {"eq": True}}}},
+    {"type": "map", "params": {"mapping": {"id": "id", "name": "name", "score": "score", "address": "address"}}},
+    {"type": "sort", "params": {"field": "score", "reverse": True}},
+]
+
+# 覆盖固定值、枚举和内置类型三种写法
+ENHANCEMENTS = {"uid": "uuid", "source": "=benchmark", "level": '["low", "high"]', "updated_at": "datetime"}
+
+
+class Skip(Exception):
+    """用例不适用于当前数据或环境"""
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=_REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(func, runs):
+    """执行 func 若干次，返回每次的耗时（秒）；每次之前先做一次垃圾回收"""
+    samples = []
+    for _ in range(runs):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+# ---- 无界面用例：接收 (格式, 文本)，返回要计时的无参函数 ----
+
+def case_parse(fmt, text):
+    from logic.parse import parse_with_format
+    return lambda: parse_with_format(text)
+
+
+def case_detect(fmt, text):
+    from logic.parse import detect_format
+    return lambda: detect_format(text)
+
+
+def _parsed_json(fmt, text):
+    if fmt not in ("json", "ndjson"):
+        raise Skip("只对 JSON 数据测量")
+    from logic.parse import parse_with_format
+    return parse_with_format(text).data
+
+
+def case_format(fmt, text):
+    from logic.formatter import Formatter
+    data = _parsed_json(fmt, text)
+    formatter = Formatter()
+    return lambda: formatter.format(data, indent=2)
+
+
+def case_format_stream(fmt, text):
+    if fmt != "json":
+        raise Skip("只对 JSON 数据测量")
+    from logic.formatter import Formatter
+    formatter = Formatter()
+    return lambda: formatter.format_stream(io.StringIO(text), io.StringIO(), indent=2)
+
+
+def case_highlight_scan(fmt, text):
+    from logic.lexer import tokenize_highlight
+    formatted = json.dumps(_parsed_json(fmt, text), indent=2, ensure_ascii=False)
+    return lambda: tokenize_highlight(formatted)
+
+
+def case_transform(fmt, text):
+    from logic.converter import Converter
+    data = _parsed_json(fmt, text)
+    if not isinstance(data, list):
+        raise Skip("数据不是列表")
+    converter = Converter()
+    # 条件写错时所有记录都会被过滤掉，测到的只是一条空流水线
+    if data and not converter.transform_data(data, TRANSFORM_STEPS):
+        raise ValueError("转换结果为空，请检查 TRANSFORM_STEPS")
+    return lambda: converter.transform_data(data, TRANSFORM_STEPS)
+
+
+def case_enhance(fmt, text):
+    from logic.converter import Converter
+    data = _parsed_json(fmt, text)
+    if not isinstance(data, list):
+        raise Skip("数据不是列表")
+    converter = Converter()
+    # 先完整跑一遍并检查新增字段，增强失败时记为错误而不是测出一个异常耗时
+    enhanced = converter.enhance_data(data[:1], ENHANCEMENTS)
+    if data and any(key not in enhanced[0] for key in ENHANCEMENTS):
+        raise ValueError("增强结果缺少字段，请检查 ENHANCEMENTS")
+    return lambda: converter.enhance_data(data, ENHANCEMENTS)
+
+
+def case_template(fmt, text):
+    if fmt != "json":
+        raise Skip("只对 JSON 数据测量")
+    from logic.converter import Converter
+    converter = Converter()
+    count = max(1, len(text) // 200)
+    schema = {"id": "id", "name": "name", "email": "email", "created_at": "datetime",
+              "score": "float", "tags": ["string"], "address": {"city": "city", "zip": "string"}}
+    return lambda: converter.generate_bulk(schema, count, io.StringIO(), seed=0)
+
+
+# ---- Tk 用例：额外接收 Tk 根窗口 ----
+
+def case_tk_insert(fmt, text, root):
+    import tkinter as tk
+    formatted = json.dumps(_parsed_json(fmt, text), indent=2, ensure_ascii=False)
+    widget = tk.Text(root)
+    widget.pack()
+
+    def run():
+        widget.delete("1.0", tk.END)
+        widget.insert(tk.END, formatted)
+        root.update_idletasks()
+    return run
+
+
+def case_tk_highlight(fmt, text, root):
+    import tkinter as tk
+    from logic.comm import highlight_json
+    formatted = json.dumps(_parsed_json(fmt, text), indent=2, ensure_ascii=False)
+    widget = tk.Text(root)
+    widget.pack()
+    widget.insert(tk.END, formatted)
+    root.update()
+    return lambda: highlight_json(widget)
+
+
+def case_tk_tree(fmt, text, root):
+    from logic.treeview import JSONTreeView
+    data = _parsed_json(fmt, text)
+    tree = JSONTreeView(root)
+
+    def run():
+        tree.load(data)
+        # 展开根节点，测量第一层子节点（或分页桶）的插入
+        for node in tree.get_children(""):
+            tree.focus(node)
+            tree.on_open(None)
+        root.update_idletasks()
+    return run
+
+
+HEADLESS_CASES = {
+    "detect": case_detect,
+    "parse": case_parse,
+    "format": case_format,
+    "format_stream": case_format_stream,
+    "highlight_scan": case_highlight_scan,
+    "transform": case_transform,
+    "enhance": case_enhance,
+    "template": case_template,
+}
+TK_CASES = {
+    "tk_insert": case_tk_insert,
+    "tk_highlight": case_tk_highlight,
+    "tk_tree": case_tk_tree,
+}
+
+
+def start_tk():
+    """创建 Tk 根窗口；没有图形环境时尝试启动 Xvfb
+
+    Returns:
+        tuple: (root 或 None, 说明, 需要在结束时终止的 Xvfb 进程)
+    """
+    import tkinter as tk
+    try:
+        return tk.Tk(), os.environ.get("DISPLAY", ""), None
+    except tk.TclError as e:
+        error = e
+    xvfb = shutil.which("Xvfb")
+    if not xvfb:
+        return None, f"无图形环境且未安装 Xvfb：{error}", None
+    display = ":99"
+    process = subprocess.Popen([xvfb, display, "-screen", "0", "1280x1024x24"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = display
+    for _ in range(50):
+        time.sleep(0.1)
+        try:
+            return tk.Tk(), f"Xvfb {display}", process
+        except tk.TclError as e:
+            error = e
+    process.terminate()
+    return None, f"Xvfb 启动失败：{error}", None
+
+
+def run_suite(sizes, formats, cases, runs, full=False, log=print):
+    results = []
+    tk_cases = [name for name in cases if name in TK_CASES]
+    root, display, xvfb = (None, "", None)
+    if tk_cases:
+        root, display, xvfb = start_tk()
+        log(f"Tk：{display}")
+    try:
+        for size_label in sizes:
+            size = parse_size(size_label)
+            for fmt in formats:
+                if not full and fmt in SLOW_FORMATS and size > SLOW_FORMAT_MAX_SIZE:
+                    for name in cases:
+                        results.append(_skipped(name, fmt, size_label, "纯 Python 解析器，需 --full"))
+                    continue
+                text = make_dataset(fmt, size)
+                for name in cases:
+                    results.append(_run_case(name, fmt, size_label, size, text, runs, full, root, display))
+                    log(_describe(results[-1]))
+                del text
+    finally:
+        if root is not None:
+            root.destroy()
+        if xvfb is not None:
+            xvfb.terminate()
+    return results
+
+
+def _skipped(name, fmt, size_label, reason):
+    return {"case": name, "format": fmt, "size": size_label, "skipped": reason}
+
+
+def _failed(name, fmt, size_label, error):
+    return {"case": name, "format": fmt, "size": size_label, "error": f"{type(error).__name__}: {error}"}
+
+
+def _run_case(name, fmt, size_label, size, text, runs, full, root, display):
+    if name in TK_CASES:
+        if root is None:
+            return _skipped(name, fmt, size_label, display)
+        if not full and size > TK_MAX_SIZE:
+            return _skipped(name, fmt, size_label, "Tk 用例默认只测到 1MB，需 --full")
+    try:
+        if name in TK_CASES:
+            func = TK_CASES[name](fmt, text, root)
+        else:
+            func = HEADLESS_CASES[name](fmt, text)
+    except Skip as e:
+        return _skipped(name, fmt, size_label, str(e))
+    except Exception as e:
+        return _failed(name, fmt, size_label, e)
+    # 大数据集只测一次，避免整套测试耗时过长
+    try:
+        samples = measure(func, 1 if size >= SIZES["100MB"] else runs)
+    except Exception as e:
+        return _failed(name, fmt, size_label, e)
+    return {
+        "case": name,
+        "format": fmt,
+        "size": size_label,
+        "bytes": len(text.encode("utf-8")),
+        "runs": len(samples),
+        "min": min(samples),
+        "median": statistics.median(samples),
+    }
+
+
+def _describe(result):
+    label = f"{result['case']:<15}{result['format']:<11}{result['size']:>6}"
+    if "skipped" in result:
+        return f"{label}  跳过：{result['skipped']}"
+    if "error" in result:
+        return f"{label}  失败：{result['error']}"
+    return f"{label}  {result['min'] * 1000:10.2f} ms（中位数 {result['median'] * 1000:.2f} ms）"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="多格式数据解析与转换工具的基准测试")
+    parser.add_argument("--sizes", default=",".join(SIZES), help="数据大小，逗号分隔")
+    parser.add_argument("--formats", default=",".join(FORMATS), help="输入格式，逗号分隔")
+    parser.add_argument("--cases", default=",".join([*HEADLESS_CASES, *TK_CASES]), help="用例，逗号分隔")
+    parser.add_argument("--runs", type=int, default=3, help="每个用例的重复次数（100MB 只运行一次）")
+    parser.add_argument("--full", action="store_true", help="慢速格式和 Tk 用例也在 100MB 上运行")
+    parser.add_argument("-o", "--output", help="结果文件，默认 benchmarks/results/<提交号>.json")
+    args = parser.parse_args()
+
+    cases = args.cases.split(",")
+    unknown = [name for name in cases if name not in HEADLESS_CASES and name not in TK_CASES]
+    if unknown:
+        parser.error(f"未知用例：{', '.join(unknown)}")
+
+    commit = git_commit()
+    started = datetime.datetime.now()
+    results = run_suite(args.sizes.split(","), args.formats.split(","), cases, args.runs, args.full)
+    report = {
+        "commit": commit,
+        "started_at": started.isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "runs": args.runs,
+        "full": args.full,
+        "results": results,
+    }
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{(commit or 'working')[:12]}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"结果已保存：{output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""命令行入口，不依赖 Tkinter，可以在脚本和定时任务中批量处理文件
+
+用法：
+    python -m cli parse data/*.json -o out/
+    python -m cli format logs/ --indent 2 -o out/ --workers 4
+    python -m cli minify big.json -o out/
+    python -m cli transform orders.json --steps steps.json
+    python -m cli template schema.json --count 10
+    python -m cli template schema.json --count 1000000 --seed 42 --ndjson -o fixtures/
+    python -m cli template schema.json --count 50000000 --seed 42 --ndjson --parallel -o fixtures/
+    python -m cli export data/*.json --to xlsx -o out/
+
+输入可以是文件、目录（递归查找支持的扩展名）或通配符；
+每个文件的耗时和结果输出到 stderr，处理结果写到 -o 指定的目录，未指定时输出到 stdout。
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# 目录输入时收集的文件扩展名
+SUPPORTED_EXTENSIONS = (".json", ".ndjson", ".jsonl", ".yaml", ".yml", ".xml", ".csv", ".tsv", ".txt")
+
+# format/minify 可以直接流式重排的扩展名，其他格式需要先解析
+STREAMING_EXTENSIONS = (".json", ".ndjson", ".jsonl")
+
+# 各命令输出文件的扩展名
+OUTPUT_SUFFIXES = {
+    "parse": ".json",
+    "format": ".json",
+    "minify": ".json",
+    "transform": ".json",
+    "template": ".json",
+}
+EXPORT_SUFFIXES = {
+    "xlsx": ".xlsx",
+    "json": ".json",
+    "ndjson": ".ndjson",
+}
+
+
+def expand_inputs(patterns):
+    """把文件、目录和通配符展开为去重后的文件列表，保持输入顺序"""
+    files = []
+    seen = set()
+
+    def add(path):
+        key = os.path.abspath(path)
+        if key not in seen:
+            seen.add(key)
+            files.append(path)
+
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        if not matches:
+            raise ValueError(f"没有匹配的文件：{pattern}")
+        for path in matches:
+            if os.path.isdir(path):
+                for dirpath, dirnames, filenames in os.walk(path):
+                    dirnames.sort()
+                    for name in sorted(filenames):
+                        if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                            add(os.path.join(dirpath, name))
+            elif os.path.isfile(path):
+                add(path)
+            else:
+                raise ValueError(f"文件不存在：{path}")
+    return files
+
+
+def output_path(path, output_dir, suffix):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(output_dir, stem + suffix)
+
+
+def _read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _parse_file(path):
+    from logic.parse import parse_with_format
+    return parse_with_format(_read(path)).data
+
+
+def _dumps(data, indent):
+    if indent is None:
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+    return json.dumps(data, indent=indent, ensure_ascii=False)
+
+
+def _write_text(text, target):
+    with open(target, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def process_file(command, path, target, options):
+    """在工作进程中处理单个文件
+
+    Args:
+        command: 子命令名
+        path: 输入文件
+        target: 输出文件，None 表示把结果文本返回给主进程
+        options: 子命令参数（可被 pickle 的字典）
+
+    Returns:
+        tuple: (文件路径, 耗时秒数, 结果文本或 None, 错误信息或 None)
+    """
+    start = time.perf_counter()
+    try:
+        text = _run_command(command, path, target, options)
+    except Exception as e:
+        return path, time.perf_counter() - start, None, f"{type(e).__name__}: {e}"
+    return path, time.perf_counter() - start, text, None
+
+
+def _run_command(command, path, target, options):
+    indent = options.get("indent")
+
+    if command in ("format", "minify") and not path.lower().endswith(STREAMING_EXTENSIONS):
+        # YAML、XML、CSV 等先解析再输出为 JSON
+        text = _dumps(_parse_file(path), None if command == "minify" else indent)
+    elif command in ("format", "minify"):
+        # JSON 流式处理，不把整个文件解析成对象
+        from logic.formatter import Formatter
+        formatter = Formatter()
+        if command == "minify":
+            indent = None
+        if target is not None:
+            formatter.format_stream(path, target, indent=indent)
+            return None
+        import io
+        buffer = io.StringIO()
+        formatter.format_stream(path, buffer, indent=indent)
+        return buffer.getvalue()
+    elif command == "export":
+        data = _parse_file(path)
+        fmt = options["to"]
+        if fmt == "xlsx":
+            from logic.converter import Converter
+            Converter().json_to_excel(data, target)
+            return None
+        if fmt == "ndjson":
+            rows = data if isinstance(data, list) else [data]
+            text = "\n".join(_dumps(row, None) for row in rows)
+        else:
+            text = _dumps(data, indent)
+    else:
+        from logic.converter import Converter
+        converter = Converter()
+        data = _parse_file(path)
+        if command == "transform":
+            data = converter.transform_data(data, options["steps"])
+        elif command == "template":
+            count = options.get("count")
+            if count is None:
+                data = converter.generate_template(data)
+            else:
+                # 批量生成时逐批写出，不在内存中保留全部记录
+                output_format = "ndjson" if options.get("ndjson") else "json"
+                if options.get("parallel"):
+                    # 记录分片到多个进程生成，按分片顺序拼接
+                    output = target
+                    if target is None:
+                        import io
+                        output = io.StringIO()
+                    converter.generate_parallel(data, count, output, seed=options.get("seed"),
+                                                workers=options["parallel"])
+                    return None if target is not None else output.getvalue()
+                if target is not None:
+                    converter.generate_bulk(data, count, target, seed=options.get("seed"),
+                                            output_format=output_format)
+                    return None
+                import io
+                buffer = io.StringIO()
+                converter.generate_bulk(data, count, buffer, seed=options.get("seed"),
+                                        output_format=output_format)
+                return buffer.getvalue()
+        text = _dumps(data, indent)
+
+    if target is None:
+        return text
+    _write_text(text, target)
+    return None
+
+
+def load_steps(value):
+    """--steps 可以是 JSON 文本，也可以是 JSON 文件路径"""
+    if os.path.isfile(value):
+        value = _read(value)
+    steps = json.loads(value)
+    if isinstance(steps, dict):
+        steps = [steps]
+    if not isinstance(steps, list):
+        raise ValueError("转换步骤必须是列表")
+    return steps
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m cli", description="多格式数据解析与转换工具（命令行版）")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_command(name, help_text, indent=True):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("inputs", nargs="+", help="输入文件、目录或通配符")
+        sub.add_argument("-o", "--output-dir", help="输出目录，不指定时输出到 stdout")
+        sub.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                         help="并行处理的进程数，1 表示在当前进程内依次处理")
+        if indent:
+            sub.add_argument("--indent", type=int, default=2, help="输出缩进空格数")
+        return sub
+
+    add_command("parse", "自动识别格式并解析为 JSON")
+    add_command("format", "流式格式化 JSON 文件")
+    add_command("minify", "流式压缩 JSON 文件", indent=False)
+    transform = add_command("transform", "按转换步骤处理数据")
+    transform.add_argument("--steps", required=True, help="转换步骤（JSON 文本或 JSON 文件路径）")
+    template = add_command("template", "根据模板生成示例数据")
+    template.add_argument("--count", type=int, help="每个模板生成的条数，指定时输出为列表")
+    template.add_argument("--seed", type=int, help="随机种子，相同的种子总是生成相同的数据（需配合 --count）")
+    template.add_argument("--ndjson", action="store_true", help="以 NDJSON（每行一条记录）输出（需配合 --count）")
+    template.add_argument("--parallel", action="store_true",
+                          help="把每个模板的记录分片到 --workers 个进程生成，输出与进程数无关（需配合 --count 和 --ndjson）")
+    export = add_command("export", "导出为其他格式")
+    export.add_argument("--to", choices=sorted(EXPORT_SUFFIXES), default="xlsx", help="导出格式")
+    return parser
+
+
+def run(args):
+    files = expand_inputs(args.inputs)
+    options = {"indent": getattr(args, "indent", None)}
+    if args.command == "transform":
+        options["steps"] = load_steps(args.steps)
+    elif args.command == "template":
+        options["count"] = args.count
+        options["seed"] = args.seed
+        options["ndjson"] = args.ndjson
+        if args.count is not None and args.count < 0:
+            raise ValueError("--count 不能为负数")
+        if args.parallel:
+            if args.count is None or not args.ndjson:
+                raise ValueError("--parallel 需要同时指定 --count 和 --ndjson")
+            # 进程用于分片，多个模板文件依次处理
+            options["parallel"] = args.workers
+    elif args.command == "export":
+        options["to"] = args.to
+
+    if args.command == "export":
+        suffix = EXPORT_SUFFIXES[args.to]
+        if args.to == "xlsx" and not args.output_dir:
+            raise ValueError("导出 Excel 需要用 -o 指定输出目录")
+    elif args.command == "template" and args.ndjson:
+        suffix = ".ndjson"
+    else:
+        suffix = OUTPUT_SUFFIXES[args.command]
+
+    targets = [None] * len(files)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+        targets = [output_path(path, args.output_dir, suffix) for path in files]
+        duplicated = {t for t in targets if targets.count(t) > 1}
+        if duplicated:
+            raise ValueError(f"多个输入文件会写到同一个输出文件：{', '.join(sorted(duplicated))}")
+
+    tasks = [(args.command, path, target, options) for path, target in zip(files, targets)]
+    workers = 1 if options.get("parallel") else max(1, min(args.workers, len(tasks)))
+    failures = 0
+    total_start = time.perf_counter()
+    if workers == 1:
+        results = (process_file(*task) for task in tasks)
+        failures = _report(results, targets)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(process_file, *zip(*tasks))
+            failures = _report(results, targets)
+    elapsed = time.perf_counter() - total_start
+    print(f"共 {len(tasks)} 个文件，失败 {failures} 个，总耗时 {elapsed:.3f}s（{options.get('parallel', workers)} 个进程）", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def _report(results, targets):
+    """按输入顺序输出每个文件的耗时和结果，返回失败数"""
+    failures = 0
+    for (path, elapsed, text, error), target in zip(results, targets):
+        if error is not None:
+            failures += 1
+            print(f"[失败] {path}  {elapsed * 1000:.1f} ms  {error}", file=sys.stderr)
+            continue
+        print(f"[完成] {path}  {elapsed * 1000:.1f} ms" + (f"  -> {target}" if target else ""), file=sys.stderr)
+        if text is not None:
+            sys.stdout.write(text)
+            # 批量生成和流式格式化的输出已经以换行结尾，不再多写一个空行
+            if not text.endswith("\n"):
+                sys.stdout.write("\n")
+    return failures
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return run(args)
+    except ValueError as e:
+        print(f"错误：{e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
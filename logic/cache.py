@@ -0,0 +1,107 @@
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+
+from logic.timing import span
+
+# 缓存上限（按估算的内存占用计算）
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# 解析后的 Python 对象通常比原始文本大好几倍，按文本长度乘以该系数估算
+SIZE_FACTOR = 8
+# 失败结果只保存异常，占用很小，按固定大小计入
+FAILURE_SIZE = 1024
+
+CacheInfo = namedtuple("CacheInfo", "hits misses entries size max_size")
+
+
+def content_key(text):
+    """文本内容的缓存键：blake2b 摘要加长度"""
+    digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    return digest, len(text)
+
+
+class ParseCache:
+    """以内容哈希为键的解析结果 LRU 缓存
+
+    同一份内容再次打开或粘贴时直接返回上次的解析结果（包括识别出的格式）；
+    解析失败也会被缓存，重复输入同一份非法内容时直接抛出上次的错误。
+    淘汰按估算的总内存占用进行，而不是按条目数。
+
+    缓存中的数据会被多次返回，调用方应把它当作只读数据。
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_BYTES, size_factor=SIZE_FACTOR, skip=()):
+        """
+        Args:
+            max_size: 估算内存占用的上限（字节）
+            size_factor: 每个字符对应的估算字节数
+            skip: 不缓存的异常类型（如超时等与内容无关的失败）
+        """
+        self.max_size = max_size
+        self.size_factor = size_factor
+        self.skip = tuple(skip)
+        self._entries = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get_or_parse(self, text, parse):
+        """返回 parse(text) 的结果，命中缓存时不再解析
+
+        Args:
+            text: 输入文本
+            parse: 实际执行解析的函数 parse(text)
+
+        Returns:
+            parse 的返回值；缓存的是失败结果时重新抛出该异常
+        """
+        with span("计算内容哈希"):
+            key = content_key(text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+            else:
+                self._misses += 1
+        if entry is not None:
+            value, error, _ = entry
+            if error is not None:
+                raise error.with_traceback(None)
+            return value
+
+        try:
+            value = parse(text)
+        except self.skip:
+            raise
+        except Exception as e:
+            self._store(key, None, e, FAILURE_SIZE)
+            raise
+        self._store(key, value, None, len(text) * self.size_factor)
+        return value
+
+    def _store(self, key, value, error, size):
+        if size > self.max_size:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[2]
+            self._entries[key] = (value, error, size)
+            self._size += size
+            while self._size > self.max_size:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._size -= evicted
+
+    def cache_info(self):
+        """命中/未命中次数、条目数和估算占用，用法与 functools.lru_cache 的 cache_info 类似"""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, len(self._entries), self._size, self.max_size)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self._hits = 0
+            self._misses = 0
@@ -1,103 +1,37 @@
 import tkinter as tk
 from tkinter import  messagebox
-from logic.converter import Converter
+from logic.parse import auto_parse
+from logic.lexer import tokenize_highlight
+from logic.text_search import MatchIndex
+from logic.replace import SCOPE_ALL, SCOPE_KEYS, SCOPE_VALUES, replace_in_data, replace_in_text
+from logic.timing import span
 import platform
 import re
 import json
-import urllib.parse
-import ast, json
-import demjson3 
 
-converter = Converter()
+# 这些第三方库在第一次使用时才导入，避免拖慢启动
+yaml = None
+xmltodict = None
+jsonpath_ng = None
 
 def lazy_import_yaml():
     global yaml
     if yaml is None:
         import yaml
+    return yaml
 
 def lazy_import_xmltodict():
     global xmltodict
     if xmltodict is None:
         import xmltodict
+    return xmltodict
 
 def lazy_import_jsonpath():
     global jsonpath_ng
     if jsonpath_ng is None:
         from jsonpath_ng import parse as jsonpath_parse
         jsonpath_ng = jsonpath_parse
-
-def auto_parse(raw_text):
-    raw_text = raw_text.strip()
-    
-    # 如果输入包含多个对象，尝试分别解析
-    if raw_text.count('}') > 1:
-        try:
-            # 将输入按 } 分割，然后重新组合每个对象
-            parts = [part + '}' for part in raw_text.split('}') if part.strip()]
-            results = []
-            for part in parts:
-                try:
-                    if not part.startswith('{'):
-                        part = '{' + part
-                    results.append(demjson3.decode(part))
-                except Exception:
-                    continue
-            if results:
-                return results[0] if len(results) == 1 else results
-        except Exception:
-            pass
-    
-    # 首先尝试使用 demjson3 解析 JavaScript 格式
-    try:
-        return demjson3.decode(raw_text)
-    except Exception:
-        pass
-    
-    # 然后尝试标准 JSON 解析
-    try:
-        return json.loads(raw_text)
-    except json.JSONDecodeError:
-        try:
-            return ast.literal_eval(raw_text)
-        except Exception:
-            pass
-
-    try:
-        lazy_import_yaml()
-        return yaml.safe_load(raw_text)
-    except Exception:
-        pass
-
-    try:
-        lazy_import_xmltodict()
-        return xmltodict.parse(raw_text)
-    except Exception:
-        pass
-
-    try:
-        return xmltodict.parse(raw_text)
-    except Exception:
-        pass
-
-    if ',' in raw_text and '\n' in raw_text:
-        try:
-            return converter.csv_to_json(raw_text)
-        except Exception:
-            pass
-
-    if '=' in raw_text:
-        try:
-            return converter.url_to_json(raw_text)
-        except Exception:
-            pass
-    try:
-        parsed = dict(urllib.parse.parse_qsl(raw_text))
-        if parsed and '=' in raw_text:
-            return parsed
-    except Exception:
-        pass
-
-    raise ValueError("无法识别输入格式")
+    return jsonpath_ng
 
 # 获取等宽字体
 def get_monospace_font(size=10):
@@ -109,73 +43,173 @@ def get_monospace_font(size=10):
     else:
         return ("Monospace", size)
 
-# JSON 语法高亮
-def highlight_json(text_widget):
-    text = text_widget.get("1.0", "end-1c")
-    for tag in ("string", "number", "keyword"):
-        text_widget.tag_remove(tag, "1.0", "end")
-
-    for match in re.finditer(r'\".*?\"', text):
-        start = f"1.0 + {match.start()} chars"
-        end = f"1.0 + {match.end()} chars"
-        text_widget.tag_add("string", start, end)
-
-    for match in re.finditer(r'\b\d+(\.\d+)?\b', text):
-        start = f"1.0 + {match.start()} chars"
-        end = f"1.0 + {match.end()} chars"
-        text_widget.tag_add("number", start, end)
-
-    for kw in ["true", "false", "null"]:
-        start = "1.0"
-        while True:
-            pos = text_widget.search(kw, start, tk.END, nocase=True)
-            if not pos:
-                break
-            end = f"{pos}+{len(kw)}c"
-            text_widget.tag_add("keyword", pos, end)
-            start = end
-
-    text_widget.tag_config("string", foreground="#d14")
-    text_widget.tag_config("number", foreground="#099")
-    text_widget.tag_config("keyword", foreground="#44f")
+# 高亮范围：可见行上下各多处理这么多行，滚动少量距离时不会露出未高亮的内容
+HIGHLIGHT_MARGIN = 100
+# 可见区域前后最多多处理的字符数，以及单次高亮的字符数上限；
+# 压缩成一行的大文档按行计算会把整篇都算进可见区域
+HIGHLIGHT_MARGIN_CHARS = 20 * 1024
+HIGHLIGHT_MAX_CHARS = 200 * 1024
+
+# 单次 tag_add 携带的范围数，避免 Tcl 命令参数过长
+HIGHLIGHT_BATCH = 2000
+
+HIGHLIGHT_COLORS = {
+    "key": "#905",
+    "string": "#d14",
+    "number": "#099",
+    "keyword": "#44f",
+}
+
+
+# 计算可见区域（含边距）的起止索引，同时按行数和字符数限制范围
+def _visible_range(text_widget, margin):
+    first = text_widget.index("@0,0")
+    last = text_widget.index(f"@{text_widget.winfo_width()},{text_widget.winfo_height()}")
+    start = text_widget.index(f"{first} - {margin} lines linestart")
+    by_chars = text_widget.index(f"{first} - {HIGHLIGHT_MARGIN_CHARS} chars")
+    if text_widget.compare(by_chars, ">", start):
+        start = by_chars
+    end = text_widget.index(f"{last} + {margin} lines lineend")
+    by_chars = text_widget.index(f"{last} + {HIGHLIGHT_MARGIN_CHARS} chars")
+    if text_widget.compare(by_chars, "<", end):
+        end = by_chars
+    limit = text_widget.index(f"{start} + {HIGHLIGHT_MAX_CHARS} chars")
+    if text_widget.compare(limit, "<", end):
+        end = limit
+    return start, end
+
+
+# JSON 语法高亮，只处理可见区域，滚动和编辑时自动重新高亮
+# precomputed 为工作线程算好的 (起点, 终点, 范围)，传入时直接应用
+def highlight_json(text_widget, margin=HIGHLIGHT_MARGIN, precomputed=None):
+    with span("语法高亮"):
+        _highlight_json(text_widget, margin, precomputed)
+
+
+def _highlight_json(text_widget, margin, precomputed):
+    _install_viewport_highlight(text_widget)
+    if precomputed is None:
+        start, end = _visible_range(text_widget, margin)
+        line, column = map(int, start.split("."))
+        ranges = tokenize_highlight(text_widget.get(start, end), line, column)
+    else:
+        start, end, ranges = precomputed
+    apply_highlight_ranges(text_widget, ranges, start, end)
+
+
+# 清除区间内的旧高亮，并按标签批量添加新的范围
+def apply_highlight_ranges(text_widget, ranges, start="1.0", end="end"):
+    for tag, color in HIGHLIGHT_COLORS.items():
+        text_widget.tag_remove(tag, start, end)
+        text_widget.tag_config(tag, foreground=color)
+        indices = ranges.get(tag, [])
+        step = HIGHLIGHT_BATCH * 2
+        for i in range(0, len(indices), step):
+            text_widget.tag_add(tag, *indices[i:i + step])
+
+
+# 接管文本框的滚动回调：滚动、内容变化或窗口尺寸变化后在空闲时重新高亮可见区域
+def _install_viewport_highlight(text_widget):
+    if getattr(text_widget, "_viewport_highlight", False):
+        return
+    text_widget._viewport_highlight = True
+    text_widget._highlight_job = None
+    original = text_widget.tk.splitlist(text_widget.cget("yscrollcommand"))
+
+    def schedule(*_):
+        if text_widget._highlight_job is None:
+            text_widget._highlight_job = text_widget.after_idle(run)
+
+    def run():
+        text_widget._highlight_job = None
+        highlight_json(text_widget)
+
+    def on_scroll(first, last):
+        if original:
+            text_widget.tk.call(*original, first, last)
+        schedule()
+
+    text_widget.config(yscrollcommand=on_scroll)
+    text_widget.bind("<Configure>", schedule, add="+")
+    text_widget.bind("<KeyRelease>", schedule, add="+")
+
+# 取得输出框当前内容的匹配索引，内容或查找条件变化时重建
+def _get_match_index(output_text, keyword, regex=False, case_sensitive=False):
+    index = getattr(output_text, "_match_index", None)
+    if index is None or output_text.edit_modified() or not index.matches(keyword, regex, case_sensitive):
+        with span("建立匹配索引"):
+            index = MatchIndex(output_text.get("1.0", "end-1c"), keyword, regex, case_sensitive)
+        output_text._match_index = index
+        # 之后任何插入或删除都会重新置位该标志，据此判断索引是否过期
+        output_text.edit_modified(False)
+    return index
+
 
 # 查找所有关键字并高亮，支持导航
-def search_text(output_text, find_entry, nav_label):
+def search_text(output_text, find_entry, nav_label, regex=False, case_sensitive=False):
     keyword = find_entry.get()
     output_text.tag_remove("found", "1.0", tk.END)
     if not keyword:
         nav_label.config(text="")
         return
-    idx = "1.0"
-    matches = []
-    while True:
-        idx = output_text.search(keyword, idx, nocase=True, stopindex=tk.END)
-        if not idx:
-            break
-        lastidx = f"{idx}+{len(keyword)}c"
-        output_text.tag_add("found", idx, lastidx)
-        matches.append(idx)
-        idx = lastidx
+    try:
+        index = _get_match_index(output_text, keyword, regex, case_sensitive)
+    except re.error as e:
+        nav_label.config(text=f"正则错误: {e}")
+        return
+    ranges = index.tk_ranges()
+    step = HIGHLIGHT_BATCH * 2
+    for i in range(0, len(ranges), step):
+        output_text.tag_add("found", *ranges[i:i + step])
     output_text.tag_config("found", background="yellow")
-    if matches:
-        nav_label.config(text=f"找到 {len(matches)} 处")
+    if len(index):
+        nav_label.config(text=f"找到 {len(index)} 处")
     else:
         nav_label.config(text="未找到")
 
+
+# 跳转到第 i 个匹配并选中
+def _goto_match(output_text, nav_label, index, i):
+    start, end = index.span(i)
+    output_text.mark_set(tk.INSERT, start)
+    output_text.tag_remove(tk.SEL, "1.0", tk.END)
+    output_text.tag_add(tk.SEL, start, end)
+    output_text.see(start)
+    nav_label.config(text=f"第 {i + 1}/{len(index)} 处")
+
+
 # 查找并跳转到下一个匹配
-def navigate_next(output_text, find_entry, nav_label):
+def navigate_next(output_text, find_entry, nav_label, regex=False, case_sensitive=False):
     keyword = find_entry.get()
     if not keyword:
         return
-    current_pos = output_text.index(tk.INSERT)
-    next_pos = output_text.search(keyword, f"{current_pos}+1c", nocase=True, stopindex=tk.END)
-    if not next_pos:
-        # 回到开头
-        next_pos = output_text.search(keyword, "1.0", nocase=True, stopindex=tk.END)
-    if next_pos:
-        output_text.mark_set(tk.INSERT, next_pos)
-        output_text.see(next_pos)
-        nav_label.config(text=f"跳转至 {next_pos}")
+    try:
+        index = _get_match_index(output_text, keyword, regex, case_sensitive)
+    except re.error as e:
+        nav_label.config(text=f"正则错误: {e}")
+        return
+    i = index.next_after(index.to_offset(output_text.index(tk.INSERT)))
+    if i is None:
+        nav_label.config(text="未找到")
+        return
+    _goto_match(output_text, nav_label, index, i)
+
+
+# 查找并跳转到上一个匹配
+def navigate_previous(output_text, find_entry, nav_label, regex=False, case_sensitive=False):
+    keyword = find_entry.get()
+    if not keyword:
+        return
+    try:
+        index = _get_match_index(output_text, keyword, regex, case_sensitive)
+    except re.error as e:
+        nav_label.config(text=f"正则错误: {e}")
+        return
+    i = index.previous_before(index.to_offset(output_text.index(tk.INSERT)))
+    if i is None:
+        nav_label.config(text="未找到")
+        return
+    _goto_match(output_text, nav_label, index, i)
 
 # 替换第一个匹配
 def replace_text(output_text, find_entry, replace_entry):
@@ -187,14 +221,72 @@ def replace_text(output_text, find_entry, replace_entry):
         output_text.delete(idx, end)
         output_text.insert(idx, replacement)
 
-# 替换所有匹配
-def replace_all_text(output_text, find_entry, replace_entry):
+# 结构化替换的范围选项（界面显示文本 -> 范围），"全部文本" 为旧的纯文本替换
+REPLACE_SCOPES = {
+    "仅值": SCOPE_VALUES,
+    "仅键": SCOPE_KEYS,
+    "键和值": SCOPE_ALL,
+    "全部文本": None,
+}
+
+
+# 替换所有匹配：输出是 JSON 时在解析后的数据上替换，只重绘发生变化的行
+def replace_all_text(output_text, find_entry, replace_entry, nav_label=None, scope=SCOPE_VALUES,
+                     jsonpath=None, regex=False, case_sensitive=False, session=None):
     keyword = find_entry.get()
     replacement = replace_entry.get()
-    content = output_text.get("1.0", tk.END)
-    new_content = content.replace(keyword, replacement)
-    output_text.delete("1.0", tk.END)
-    output_text.insert(tk.END, new_content)
+    if not keyword:
+        return
+    content = output_text.get("1.0", "end-1c")
+    data = None
+    if scope is not None:
+        if session is not None and session.is_rendered(content):
+            # 输出区就是会话数据的渲染结果，直接复用，不必重新解析
+            data = session.output
+        else:
+            try:
+                data = auto_parse(content)
+            except Exception:
+                data = None
+    if data is None:
+        # 不是结构化数据，退回到纯文本替换（同样遵循正则和大小写选项）
+        try:
+            new_content, count = replace_in_text(content, keyword, replacement, regex, case_sensitive)
+        except re.error as e:
+            if nav_label is not None:
+                nav_label.config(text=f"正则错误: {e}")
+            return 0
+        if count:
+            output_text.delete("1.0", tk.END)
+            output_text.insert(tk.END, new_content)
+    else:
+        new_data, count = replace_in_data(data, keyword, replacement, scope, jsonpath,
+                                          regex, case_sensitive)
+        if count:
+            new_text = _rerender_changed_lines(output_text, content, data, new_data)
+            if session is not None:
+                session.set_output(new_data, rendered=new_text)
+    if nav_label is not None:
+        nav_label.config(text=f"已替换 {count} 处")
+    return count
+
+
+# 只替换与旧渲染结果不同的行；输出不是标准的 2 空格缩进格式或行数变化时整体重绘
+def _rerender_changed_lines(output_text, content, old_data, new_data):
+    old_text = json.dumps(old_data, indent=2, ensure_ascii=False)
+    new_text = json.dumps(new_data, indent=2, ensure_ascii=False)
+    old_lines = old_text.split("\n")
+    new_lines = new_text.split("\n")
+    if content != old_text or len(old_lines) != len(new_lines):
+        output_text.delete("1.0", tk.END)
+        output_text.insert(tk.END, new_text)
+    else:
+        for line, (old, new) in enumerate(zip(old_lines, new_lines), start=1):
+            if old != new:
+                output_text.delete(f"{line}.0", f"{line}.end")
+                output_text.insert(f"{line}.0", new)
+    highlight_json(output_text)
+    return new_text
 
 # 暗黑模式切换
 def toggle_dark_mode(is_dark_mode, root, widgets):
@@ -208,23 +300,34 @@ def toggle_dark_mode(is_dark_mode, root, widgets):
             w.config(bg="white", fg="black", insertbackground="black")
 
 # JSONPath 提取显示到输出框，不弹窗
-def run_jsonpath(output_text, jsonpath_entry):
+def run_jsonpath(output_text, jsonpath_entry, session=None, tree_view=None):
     expr = jsonpath_entry.get().strip()
-    raw = output_text.get("1.0", tk.END).strip()
+    raw = output_text.get("1.0", "end-1c")
     if not expr:
         messagebox.showwarning("提示", "请输入 JSONPath 表达式")
         return
-    try:
-        data = json.loads(raw)
-    except Exception as e:
-        messagebox.showerror("错误", f"输出不是合法 JSON：\n{e}")
-        return
+    if session is not None and session.is_rendered(raw):
+        data = session.output
+    else:
+        try:
+            data = json.loads(raw)
+        except Exception as e:
+            messagebox.showerror("错误", f"输出不是合法 JSON：\n{e}")
+            return
     try:
         lazy_import_jsonpath()
         jsonpath_expr = jsonpath_ng(expr)
-        result = [match.value for match in jsonpath_expr.find(data)]
+        with span("JSONPath 查询"):
+            result = [match.value for match in jsonpath_expr.find(data)]
+        if session is not None:
+            session.set_output(result)
+            rendered = session.render(2)
+        else:
+            rendered = json.dumps(result, indent=2, ensure_ascii=False)
         output_text.delete("1.0", tk.END)
-        output_text.insert(tk.END, json.dumps(result, indent=2, ensure_ascii=False))
+        output_text.insert(tk.END, rendered)
         highlight_json(output_text)
+        if tree_view is not None:
+            tree_view.load(result)
     except Exception as e:
         messagebox.showerror("JSONPath 错误", str(e))
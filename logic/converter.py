@@ -1,30 +1,280 @@
 import json
 import csv
+import contextlib
+import copy
+import hashlib
 import io
+import os
+import shutil
+import tempfile
 import urllib.parse
-import xmltodict
-import yaml
-import pandas as pd
 import random
 import datetime
-import uuid
+from collections import namedtuple
+
+from logic.cache import ParseCache
+from logic.timing import span
+
+# 批量生成时日期、时间类字段使用的固定参考时间，保证同一种子总是生成完全相同的数据
+REFERENCE_TIME = datetime.datetime(2024, 1, 1, 9, 30, 0)
+# 批量生成时每批序列化并写出的记录数
+BULK_BATCH_SIZE = 1000
+# 并行生成时每个分片的记录数；分片边界只取决于该值，与进程数无关
+SHARD_SIZE = 100000
+
+# 编译后的模板按模板内容哈希缓存；编译出的函数很小，按模板文本长度估算占用
+template_cache = ParseCache(max_size=16 * 1024 * 1024, size_factor=4)
+
+
+# 生成函数都用 int(rng.random() * n) 取下标或整数：比 rng.choice / rng.randint
+# 内部的拒绝采样快好几倍，对示例数据来说分布上的差别可以忽略
+_STRINGS = ("张三", "李四", "王五", "赵六")
+_NAMES = ("李雷", "韩梅梅", "张三丰", "王小明")
+_TEXTS = ("这是一段示例文本", "用于测试的文字内容", "Hello World", "示例描述信息")
+_ADDRESSES = ("北京市朝阳区三里屯街道", "上海市浦东新区张江路", "广州市天河区体育西路", "深圳市南山区科技园")
+_CITIES = ("北京", "上海", "广州", "深圳", "杭州", "南京", "成都", "武汉")
+_PROVINCES = ("北京", "上海", "广东", "江苏", "浙江", "四川", "湖北", "福建")
+_STATUSES = ("active", "inactive", "pending", "deleted")
+_COLORS = ("red", "blue", "green", "yellow", "purple")
+_PHONE_PREFIXES = ("13", "15", "17", "18", "19")
+# UUID 第 4 版的版本号与变体位
+_UUID_CLEAR = ~((0xf000 << 64) | (0xc000 << 48))
+_UUID_SET = (0x4000 << 64) | (0x8000 << 48)
+
+
+def _pick(values):
+    """从 values 中随机选择一个值的生成函数"""
+    values = tuple(values)
+    count = len(values)
+    return lambda rng, now: values[int(rng.random() * count)]
+
+
+def _integer(low, high):
+    """生成 [low, high] 内随机整数的生成函数"""
+    width = high - low + 1
+    return lambda rng, now: low + int(rng.random() * width)
+
+
+def _phone(rng, now):
+    return f"{_PHONE_PREFIXES[int(rng.random() * 5)]}{100000000 + int(rng.random() * 900000000)}"
+
+
+def _uuid(rng, now):
+    # 由 rng 生成，同一种子得到同样的 UUID；直接拼接十六进制，结果与 uuid.UUID(int=..., version=4) 相同
+    value = (rng.getrandbits(128) & _UUID_CLEAR) | _UUID_SET
+    text = f"{value:032x}"
+    return f"{text[:8]}-{text[8:12]}-{text[12:16]}-{text[16:20]}-{text[20:]}"
+
+
+def _ip(rng, now):
+    random_value = rng.random
+    return (f"{1 + int(random_value() * 255)}.{1 + int(random_value() * 255)}."
+            f"{1 + int(random_value() * 255)}.{1 + int(random_value() * 255)}")
+
+
+# 简化模板的类型名 -> 生成函数 f(rng, now)
+# rng 可以是 random 模块本身或 random.Random 实例，now 是返回当前时间的函数
+SIMPLE_TYPES = {
+    "string": _pick(_STRINGS),
+    "name": _pick(_NAMES),
+    "text": _pick(_TEXTS),
+    "number": _integer(1, 100),
+    "int": _integer(1, 100),
+    "integer": _integer(1, 100),
+    "float": lambda rng, now: round(rng.random() * 100, 2),
+    "boolean": lambda rng, now: rng.random() < 0.5,
+    "null": lambda rng, now: None,
+    "date": lambda rng, now: now().date().isoformat(),
+    "time": lambda rng, now: now().time().isoformat()[:8],
+    "datetime": lambda rng, now: now().isoformat(),
+    "email": lambda rng, now: f"user{1 + int(rng.random() * 100)}@example.com",
+    "url": lambda rng, now: f"https://example.com/page/{1 + int(rng.random() * 100)}",
+    "image": lambda rng, now: f"https://picsum.photos/id/{1 + int(rng.random() * 1000)}/200/300",
+    "avatar": lambda rng, now: f"https://i.pravatar.cc/150?img={1 + int(rng.random() * 70)}",
+    "phone": _phone,
+    "mobile": _phone,
+    "address": _pick(_ADDRESSES),
+    "city": _pick(_CITIES),
+    "province": _pick(_PROVINCES),
+    "id": _integer(1, 1000),
+    "guid": _uuid,
+    "uuid": _uuid,
+    "status": _pick(_STATUSES),
+    "color": _pick(_COLORS),
+    "ip": _ip,
+}
+
+
+def _parse_enum(type_str):
+    """类型字符串是 JSON 数组时返回其元素列表，否则返回 None"""
+    try:
+        values = json.loads(type_str)
+    except ValueError:
+        return None
+    return values if isinstance(values, list) else None
+
+
+def shard_seed(seed, index):
+    """由基础种子和分片序号派生分片的随机种子，同样的输入总是得到同样的种子"""
+    digest = hashlib.blake2b(f"{seed}:{index}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def _generate_shard(schema, count, path, seed, now):
+    """在工作进程中生成一个分片并写入 path"""
+    Converter().generate_bulk(schema, count, path, seed=seed, output_format="ndjson", now=now)
+    return path
+
+
+def _constant(value):
+    """总是返回 value 的生成函数；可变对象每次返回一份副本"""
+    if isinstance(value, (dict, list)):
+        value = copy.deepcopy(value)
+        return lambda rng, now: copy.deepcopy(value)
+    return lambda rng, now: value
+
+
+def _choice(values):
+    """从 values 中随机选择的生成函数；对象和数组要复制一份，避免多条记录共享同一个对象"""
+    values = tuple(values)
+    if not values:
+        raise ValueError("模板中的枚举列表不能为空")
+    if any(isinstance(value, (dict, list)) for value in values):
+        count = len(values)
+        return lambda rng, now: copy.deepcopy(values[int(rng.random() * count)])
+    return _pick(values)
+
+
+@contextlib.contextmanager
+def _open_output(target):
+    """target 可以是文件路径，也可以是已打开的文本流（不会被关闭）"""
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, "w", encoding="utf-8", newline="") as f:
+            yield f
+    else:
+        yield target
+
+
+def _append_file(out, path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        shutil.copyfileobj(f, out, 1024 * 1024)
+    os.remove(path)
+
+
+# 转换执行计划的一个阶段：names 为对应的步骤类型，kind 为 "fused"（逐元素处理，
+# 返回迭代器）或 "materialize"（消费迭代器，返回完整结果），run(items) 执行该阶段
+TransformStage = namedtuple("TransformStage", "names kind run")
+
+
+def _match_condition(item, cond):
+    for field, value in cond.items():
+        if isinstance(value, dict):
+            # 支持运算符
+            for op, val in value.items():
+                if op == "eq" and item.get(field) != val:
+                    return False
+                elif op == "ne" and item.get(field) == val:
+                    return False
+                elif op == "gt" and not (isinstance(item.get(field), (int, float)) and item.get(field) > val):
+                    return False
+                elif op == "lt" and not (isinstance(item.get(field), (int, float)) and item.get(field) < val):
+                    return False
+                elif op == "in" and item.get(field) not in val:
+                    return False
+        else:
+            # 简单相等判断
+            if item.get(field) != value:
+                return False
+    return True
+
+
+def _map_item(data, mapping):
+    if isinstance(data, list):
+        return [_map_item(item, mapping) for item in data]
+
+    if isinstance(data, dict):
+        result = {}
+        for old_key, new_key in mapping.items():
+            if old_key in data:
+                result[new_key] = data[old_key]
+        return result
+
+    return data
+
+
+def _condition_before_map(condition, mapping):
+    """把 map 之后的过滤条件改写为 map 之前的等价条件
+
+    map 之后的字段 new 等于 map 之前的 old（old 不存在时两边都取不到值），
+    因此只要每个条件字段都恰好由一个源字段映射而来，就可以改写条件字段名。
+    条件字段不在映射结果中、或由多个源字段映射而来时无法改写，返回 None。
+    """
+    if not isinstance(condition, dict) or not isinstance(mapping, dict):
+        return None
+    sources = {}
+    try:
+        for old_key, new_key in mapping.items():
+            sources.setdefault(new_key, []).append(old_key)
+    except TypeError:
+        return None
+    rewritten = {}
+    for field, value in condition.items():
+        fields = sources.get(field)
+        if fields is None or len(fields) != 1:
+            return None
+        rewritten[fields[0]] = value
+    return rewritten
+
+
+def _fused_pass(ops):
+    """把若干 filter/map 合并为一次遍历：每个元素依次经过所有步骤，被过滤掉即停止"""
+    def run(items):
+        for item in items:
+            for kind, arg in ops:
+                if kind == "filter":
+                    if not _match_condition(item, arg):
+                        break
+                else:
+                    item = _map_item(item, arg)
+            else:
+                yield item
+    return run
+
+
+def _sort_items(items, field, reverse=False):
+    return sorted(items, key=lambda x: x.get(field, ""), reverse=reverse)
+
+
+def _group_items(items, field):
+    groups = {}
+    for item in items:
+        key = item.get(field)
+        if key not in groups:
+            groups[key] = []
+        groups[key].append(item)
+    return groups
+
 
 class Converter:
     def __init__(self):
-        self.type_generators = {
-            'string': self._generate_string,
-            'number': self._generate_number,
-            'integer': self._generate_integer,
-            'boolean': self._generate_boolean,
-            'array': self._generate_array,
-            'object': self._generate_object,
-            'null': self._generate_null
+        # JSON Schema 类型 -> 编译函数，编译结果是生成函数 f(rng, now)
+        self.type_compilers = {
+            'string': self._compile_string,
+            'number': self._compile_number,
+            'integer': self._compile_integer,
+            'boolean': self._compile_boolean,
+            'array': self._compile_array,
+            'object': self._compile_object,
+            'null': self._compile_null
         }
 
+    # yaml、xmltodict、pandas 导入较慢，都在第一次使用时才导入
     def xml_to_json(self, xml_str):
+        import xmltodict
         return xmltodict.parse(xml_str)
 
     def yaml_to_json(self, yaml_str):
+        import yaml
         return yaml.safe_load(yaml_str)
 
     def csv_to_json(self, csv_str):
@@ -78,10 +328,12 @@ class Converter:
         return dict(urllib.parse.parse_qsl(url_str))
 
     def excel_to_json(self, file_path):
+        import pandas as pd
         df = pd.read_excel(file_path)
         return json.loads(df.to_json(orient='records'))
 
     def json_to_excel(self, json_data, save_path):
+        import pandas as pd
         df = pd.DataFrame(json_data)
         df.to_excel(save_path, index=False)
 
@@ -96,20 +348,29 @@ class Converter:
                     "现有字段": "新的固定值或类型"
                 }
         """
+        # 每个字段只编译一次，所有记录共用编译好的生成函数
+        plans = []
+        for key, value_type in enhancements.items():
+            if isinstance(value_type, str) and value_type.startswith("="):
+                # 固定值，直接赋值
+                plans.append((key, _constant(value_type[1:])))
+            else:
+                # 使用模板生成器生成值
+                plans.append((key, self._compile_simple_value(value_type)))
+        return self._apply_enhancements(data, plans)
+
+    def _apply_enhancements(self, data, plans):
+        """用编译好的 [(字段, 生成函数)] 增强列表中的每条记录或单个字典"""
         if isinstance(data, list):
-            return [self.enhance_data(item, enhancements) for item in data]
-        
+            return [self._apply_enhancements(item, plans) for item in data]
+
         if isinstance(data, dict):
             result = data.copy()
-            for key, value_type in enhancements.items():
-                if isinstance(value_type, str) and value_type.startswith("="):
-                    # 固定值，直接赋值
-                    result[key] = value_type[1:]
-                else:
-                    # 使用模板生成器生成值
-                    result[key] = self._generate_simple_value(value_type)
+            now = datetime.datetime.now
+            for key, plan in plans:
+                result[key] = plan(random, now)
             return result
-        
+
         return data
 
     def auto_to_json(self, raw_text):
@@ -130,12 +391,12 @@ class Converter:
             pass
 
         try:
-            return yaml.safe_load(raw_text)
+            return self.yaml_to_json(raw_text)
         except Exception:
             pass
 
         try:
-            return xmltodict.parse(raw_text)
+            return self.xml_to_json(raw_text)
         except Exception:
             pass
 
@@ -153,7 +414,7 @@ class Converter:
 
         raise ValueError("无法识别输入格式")
 
-    def generate_template(self, schema):
+    def generate_template(self, schema, rng=random, now=datetime.datetime.now):
         """根据模板生成示例数据
         
         支持两种格式：
@@ -172,177 +433,281 @@ class Converter:
         
         Args:
             schema: 模板对象
+            rng: 随机数来源，默认使用 random 模块；传入 random.Random(种子) 可得到可复现的结果
+            now: 返回当前时间的函数，日期、时间类字段使用
             
         Returns:
             生成的示例数据
         """
-        # 如果是标准 JSON Schema，使用原有逻辑
-        if isinstance(schema, dict) and schema.get('type') == 'object' and 'properties' in schema:
-            return self._generate_from_json_schema(schema)
-            
-        # 否则使用简化格式处理
-        return self._generate_from_simple_schema(schema)
+        return self.compile_template(schema)(rng, now)
+
+    def compile_template(self, schema):
+        """把模板编译为生成函数 plan(rng, now)，每调用一次生成一条数据
+
+        模板只遍历一次：类型分派、枚举列表、取值范围和必填字段都在编译时确定，
+        生成时只执行预先构建好的函数。编译结果按模板内容的哈希缓存，
+        同一模板再次使用（如每条记录、每次点击生成）时直接复用。
+
+        Args:
+            schema: 模板对象，格式同 generate_template
+
+        Returns:
+            callable: plan(rng, now)
+        """
+        key_text = json.dumps(schema, ensure_ascii=False, default=repr)
+        return template_cache.get_or_parse(key_text, lambda _: self._compile(schema))
+
+    def generate_parallel(self, schema, count, target, seed=None, workers=None,
+                          shard_size=SHARD_SIZE, now=REFERENCE_TIME):
+        """把记录数分片到多个进程并行生成 NDJSON
+
+        第 i 个分片使用 shard_seed(seed, i) 作为种子，各进程把分片写入临时文件，
+        主进程按分片顺序拼接到 target。输出只取决于模板、种子、分片大小和参考时间，
+        与进程数无关；workers=1 时在当前进程中依次生成，结果完全相同。
+
+        Args:
+            schema: 模板对象，简化格式和标准 JSON Schema 格式都支持
+            count: 记录数
+            target: 输出文件路径或已打开的文本流（不会被关闭）
+            seed: 基础随机种子，None 表示随机选择一个
+            workers: 进程数，默认为 CPU 核数
+            shard_size: 每个分片的记录数
+            now: 参考时间
+
+        Returns:
+            int: 分片数
+        """
+        if count < 0:
+            raise ValueError("记录数不能为负数")
+        if shard_size <= 0:
+            raise ValueError("分片大小必须大于 0")
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        # 先在当前进程编译一次，模板有误时直接报错而不是在每个工作进程中失败
+        self.compile_template(schema)
+
+        shards = [(index, min(shard_size, count - start)) for index, start in enumerate(range(0, count, shard_size))]
+        workers = max(1, min(workers or os.cpu_count() or 1, len(shards)))
+        is_path = isinstance(target, (str, os.PathLike))
+        # 临时文件放在输出文件旁边，拼接时不跨文件系统
+        temp_dir = tempfile.mkdtemp(prefix=".shards-", dir=os.path.dirname(os.path.abspath(target)) if is_path else None)
+        try:
+            paths = [os.path.join(temp_dir, f"{index:06d}.ndjson") for index, _ in shards]
+            args = [(schema, size, path, shard_seed(seed, index), now) for (index, size), path in zip(shards, paths)]
+            with span("并行生成"), _open_output(target) as out:
+                if workers == 1:
+                    for arg in args:
+                        _append_file(out, _generate_shard(*arg))
+                else:
+                    from concurrent.futures import ProcessPoolExecutor
+                    with ProcessPoolExecutor(max_workers=workers) as executor:
+                        futures = [executor.submit(_generate_shard, *arg) for arg in args]
+                        try:
+                            # 按提交顺序拼接，前面的分片完成后即可写出，后面的分片仍在生成
+                            for future in futures:
+                                _append_file(out, future.result())
+                        except BaseException:
+                            for future in futures:
+                                future.cancel()
+                            raise
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        return len(shards)
+
+    def _compile(self, schema):
+        with span("编译模板"):
+            # 如果是标准 JSON Schema，使用原有逻辑
+            if isinstance(schema, dict) and schema.get('type') == 'object' and 'properties' in schema:
+                return self._compile_json_schema(schema)
+
+            # 否则使用简化格式处理
+            return self._compile_simple_schema(schema)
+
+    def generate_bulk(self, schema, count, target, seed=None, output_format="ndjson",
+                      now=REFERENCE_TIME, batch_size=BULK_BATCH_SIZE):
+        """按模板批量生成 count 条记录并写入文件
+
+        记录逐批序列化写出，内存占用与 count 无关。随机数来自以 seed 初始化的
+        random.Random，日期、时间类字段使用固定的 now，因此同一模板、种子和参考时间
+        总是生成逐字节相同的输出。
+
+        Args:
+            schema: 模板对象，格式同 generate_template
+            count: 记录数
+            target: 输出文件路径或已打开的文本流（不会被关闭）
+            seed: 随机种子，None 表示不可复现的随机结果
+            output_format: "ndjson"（每行一条记录）或 "json"（JSON 数组，每行一个元素）
+            now: 参考时间
+            batch_size: 每批写出的记录数
+
+        Returns:
+            int: 写入的字符数
+        """
+        if output_format not in ("ndjson", "json"):
+            raise ValueError(f"不支持的输出格式：{output_format}")
+        if count < 0:
+            raise ValueError("记录数不能为负数")
 
-    def _generate_from_json_schema(self, schema):
-        """使用原有的 JSON Schema 处理逻辑"""
+        rng = random.Random(seed)
+        clock = lambda: now
+        encode = json.JSONEncoder(ensure_ascii=False).encode
+        plan = self.compile_template(schema)
+        if output_format == "ndjson":
+            head, separator, tail = "", "\n", "\n" if count else ""
+        else:
+            head, separator, tail = "[\n", ",\n", "\n]\n" if count else "]\n"
+
+        written = 0
+        with span("批量生成"), _open_output(target) as f:
+            written += f.write(head)
+            for start in range(0, count, batch_size):
+                # 一批记录用一次 join 拼接后写出
+                text = separator.join(map(encode, [plan(rng, clock) for _ in range(min(batch_size, count - start))]))
+                if start:
+                    written += f.write(separator)
+                written += f.write(text)
+            written += f.write(tail)
+        return written
+
+    def _compile_json_schema(self, schema):
+        """编译标准 JSON Schema 节点"""
         if not isinstance(schema, dict):
-            return schema
+            return _constant(schema)
 
         if 'type' not in schema:
             if 'properties' in schema:
-                return self._generate_object(schema)
+                return self._compile_object(schema)
             elif 'items' in schema:
-                return self._generate_array(schema)
+                return self._compile_array(schema)
             else:
-                return schema
+                return _constant(schema)
 
-        type_name = schema['type']
-        generator = self.type_generators.get(type_name)
-        if generator:
-            return generator(schema)
-        return None
+        compiler = self.type_compilers.get(schema['type'])
+        if compiler:
+            return compiler(schema)
+        return _constant(None)
+
+    def _compile_property(self, schema):
+        """编译 JSON Schema 中的属性或数组元素
+
+        是 JSON Schema 节点时按 JSON Schema 处理，否则按简化格式处理，
+        因此 properties 中也可以直接写 "email"、["string"] 这样的简化写法。
+        """
+        if isinstance(schema, dict) and (schema.get('type') in self.type_compilers
+                                         or ('type' not in schema and ('properties' in schema or 'items' in schema))):
+            return self._compile_json_schema(schema)
+        return self._compile_simple_schema(schema)
 
-    def _generate_from_simple_schema(self, schema):
-        """处理简化格式的模板"""
+    def _compile_simple_schema(self, schema):
+        """编译简化格式的模板"""
         if isinstance(schema, str):
-            return self._generate_simple_value(schema)
+            return self._compile_simple_value(schema)
         elif isinstance(schema, list):
             if not schema:
-                return []
+                return lambda rng, now: []
+            item = self._compile_simple_schema(schema[0])
             # 生成1-3个元素
-            count = random.randint(1, 3)
-            return [self._generate_from_simple_schema(schema[0]) for _ in range(count)]
+            return lambda rng, now: [item(rng, now) for _ in range(1 + int(rng.random() * 3))]
         elif isinstance(schema, dict):
-            return {k: self._generate_from_simple_schema(v) for k, v in schema.items()}
-        return schema
-
-    def _generate_simple_value(self, type_str):
-        """根据类型字符串生成值"""
-        type_map = {
-            "string": lambda: random.choice(["张三", "李四", "王五", "赵六"]),
-            "name": lambda: random.choice(["李雷", "韩梅梅", "张三丰", "王小明"]),
-            "text": lambda: random.choice([
-                "这是一段示例文本",
-                "用于测试的文字内容",
-                "Hello World",
-                "示例描述信息"
-            ]),
-            "number": lambda: random.randint(1, 100),
-            "int": lambda: random.randint(1, 100),
-            "integer": lambda: random.randint(1, 100),
-            "float": lambda: round(random.uniform(0, 100), 2),
-            "boolean": lambda: random.choice([True, False]),
-            "null": lambda: None,
-            "date": lambda: datetime.date.today().isoformat(),
-            "time": lambda: datetime.datetime.now().time().isoformat()[:8],
-            "datetime": lambda: datetime.datetime.now().isoformat(),
-            "email": lambda: f"user{random.randint(1,100)}@example.com",
-            "url": lambda: f"https://example.com/page/{random.randint(1, 100)}",
-            "image": lambda: f"https://picsum.photos/id/{random.randint(1,1000)}/200/300",
-            "avatar": lambda: f"https://i.pravatar.cc/150?img={random.randint(1,70)}",
-            "phone": lambda: f"1{random.choice(['3','5','7','8','9'])}{random.randint(100000000,999999999)}",
-            "mobile": lambda: f"1{random.choice(['3','5','7','8','9'])}{random.randint(100000000,999999999)}",
-            "address": lambda: random.choice([
-                "北京市朝阳区三里屯街道",
-                "上海市浦东新区张江路",
-                "广州市天河区体育西路",
-                "深圳市南山区科技园"
-            ]),
-            "city": lambda: random.choice([
-                "北京", "上海", "广州", "深圳",
-                "杭州", "南京", "成都", "武汉"
-            ]),
-            "province": lambda: random.choice([
-                "北京", "上海", "广东", "江苏",
-                "浙江", "四川", "湖北", "福建"
-            ]),
-            "id": lambda: random.randint(1, 1000),
-            "guid": lambda: str(uuid.uuid4()),
-            "uuid": lambda: str(uuid.uuid4()),
-            "status": lambda: random.choice(["active", "inactive", "pending", "deleted"]),
-            "color": lambda: random.choice(["red", "blue", "green", "yellow", "purple"]),
-            "ip": lambda: f"{random.randint(1,255)}.{random.randint(1,255)}.{random.randint(1,255)}.{random.randint(1,255)}"
-        }
-        
+            fields = [(k, self._compile_simple_schema(v)) for k, v in schema.items()]
+            return lambda rng, now: {k: field(rng, now) for k, field in fields}
+        return _constant(schema)
+
+    def _compile_simple_value(self, type_str):
+        """根据类型字符串编译生成函数"""
         # 如果是枚举值（格式如：["a", "b", "c"]），直接从中随机选择
-        try:
-            enum_values = json.loads(type_str)
-            if isinstance(enum_values, list):
-                return random.choice(enum_values)
-        except:
-            pass
-            
+        enum_values = _parse_enum(type_str) if type_str.startswith("[") else None
+        if enum_values is not None:
+            return _choice(enum_values)
+
         # 使用预定义的类型生成器，如果没有对应的类型，返回原字符串
-        return type_map.get(type_str.lower(), lambda: type_str)()
+        generator = SIMPLE_TYPES.get(type_str.lower())
+        if generator is None:
+            return lambda rng, now: type_str
+        return generator
 
-    def _generate_string(self, schema):
-        """生成字符串类型的示例数据"""
+    def _compile_string(self, schema):
+        """编译字符串类型"""
         if 'enum' in schema:
-            return random.choice(schema['enum'])
+            return _choice(schema['enum'])
         if 'format' in schema:
             format_type = schema['format']
             if format_type == 'date-time':
-                return datetime.datetime.now().isoformat()
+                return lambda rng, now: now().isoformat()
             elif format_type == 'date':
-                return datetime.date.today().isoformat()
+                return lambda rng, now: now().date().isoformat()
             elif format_type == 'time':
-                return datetime.datetime.now().time().isoformat()
+                return lambda rng, now: now().time().isoformat()
             elif format_type == 'email':
-                return 'user@example.com'
+                return lambda rng, now: 'user@example.com'
             elif format_type == 'uri':
-                return 'http://example.com'
+                return lambda rng, now: 'http://example.com'
         if 'pattern' in schema:
-            return f"符合正则 {schema['pattern']} 的字符串"
-        return "示例字符串"
+            text = f"符合正则 {schema['pattern']} 的字符串"
+            return lambda rng, now: text
+        return lambda rng, now: "示例字符串"
 
-    def _generate_number(self, schema):
-        """生成数字类型的示例数据"""
+    def _compile_number(self, schema):
+        """编译数字类型"""
         if 'enum' in schema:
-            return random.choice(schema['enum'])
+            return _choice(schema['enum'])
         minimum = schema.get('minimum', 0)
         maximum = schema.get('maximum', 100)
         if 'multipleOf' in schema:
             multiple = schema['multipleOf']
-            return (random.randint(minimum // multiple, maximum // multiple) * multiple)
-        return random.uniform(minimum, maximum)
+            low, high = minimum // multiple, maximum // multiple
+            if low > high:
+                raise ValueError(f"模板中 minimum 不能大于 maximum：{schema}")
+            width = high - low + 1
+            return lambda rng, now: (low + int(rng.random() * width)) * multiple
+        return lambda rng, now: rng.uniform(minimum, maximum)
 
-    def _generate_integer(self, schema):
-        """生成整数类型的示例数据"""
+    def _compile_integer(self, schema):
+        """编译整数类型"""
         if 'enum' in schema:
-            return random.choice(schema['enum'])
+            return _choice(schema['enum'])
         minimum = schema.get('minimum', 0)
         maximum = schema.get('maximum', 100)
-        return random.randint(minimum, maximum)
+        if minimum > maximum:
+            raise ValueError(f"模板中 minimum 不能大于 maximum：{schema}")
+        return _integer(minimum, maximum)
 
-    def _generate_boolean(self, schema):
-        """生成布尔类型的示例数据"""
-        return random.choice([True, False])
+    def _compile_boolean(self, schema):
+        """编译布尔类型"""
+        return lambda rng, now: rng.random() < 0.5
 
-    def _generate_array(self, schema):
-        """生成数组类型的示例数据"""
+    def _compile_array(self, schema):
+        """编译数组类型"""
         if not schema.get('items'):
-            return []
+            return lambda rng, now: []
         min_items = schema.get('minItems', 1)
         max_items = schema.get('maxItems', 3)
-        length = random.randint(min_items, max_items)
-        items_schema = schema['items']
-        return [self.generate_template(items_schema) for _ in range(length)]
+        if min_items > max_items:
+            raise ValueError(f"模板中 minItems 不能大于 maxItems：{schema}")
+        item = self._compile_property(schema['items'])
+        width = max_items - min_items + 1
+        return lambda rng, now: [item(rng, now) for _ in range(min_items + int(rng.random() * width))]
 
-    def _generate_object(self, schema):
-        """生成对象类型的示例数据"""
-        result = {}
+    def _compile_object(self, schema):
+        """编译对象类型：必填字段总是生成，其他字段各有一半概率生成"""
         if 'properties' not in schema:
+            return lambda rng, now: {}
+
+        required = set(schema.get('required', []))
+        fields = [(name, self._compile_property(prop_schema), name in required)
+                  for name, prop_schema in schema['properties'].items()]
+
+        def generate(rng, now):
+            result = {}
+            for name, field, is_required in fields:
+                if is_required or rng.random() > 0.5:
+                    result[name] = field(rng, now)
             return result
-        
-        required = schema.get('required', [])
-        for prop_name, prop_schema in schema['properties'].items():
-            if prop_name in required or random.random() > 0.5:
-                result[prop_name] = self.generate_template(prop_schema)
-        return result
+        return generate
 
-    def _generate_null(self, schema):
-        """生成 null 类型的示例数据"""
-        return None
+    def _compile_null(self, schema):
+        """编译 null 类型"""
+        return _constant(None)
 
     def to_javascript(self, data, format_type="const", variable_name="data"):
         """将数据转换为 JavaScript 格式
@@ -433,6 +798,9 @@ class Converter:
     def transform_data(self, data, transforms):
         """转换数据结构
         
+        列表数据按执行计划处理：相邻的 filter/map 合并为一次遍历，不产生中间列表，
+        只在 sort/group/aggregate/flatten 处生成新列表；其他数据逐步处理。
+        
         Args:
             data: 原始数据
             transforms: 转换配置列表，每个配置是一个字典：
@@ -441,45 +809,151 @@ class Converter:
                     "params": {} # 转换参数
                 }
         """
+        if not isinstance(data, list):
+            return self._transform_steps(data, transforms)
+
+        stages, rest = self._plan_transforms(transforms)
         result = data
-        for transform in transforms:
+        pending = []
+        for stage in stages:
+            if stage.kind == "fused":
+                pending.append(stage)
+                continue
+            # 合并遍历在下一个物化步骤消费时才真正执行，耗时计入该步骤
+            names = [name for fused in pending for name in fused.names] + stage.names
+            with span(f"转换 {'+'.join(names)}"):
+                for fused in pending:
+                    result = fused.run(result)
+                result = stage.run(result)
+            pending = []
+        if pending:
+            with span(f"转换 {'+'.join(name for fused in pending for name in fused.names)}"):
+                for fused in pending:
+                    result = fused.run(result)
+                result = list(result)
+        if rest:
+            result = self._transform_steps(result, rest)
+        return result
+
+    def _plan_transforms(self, transforms):
+        """把转换步骤编译为列表数据的执行计划
+
+        相邻的 filter/map 合并为一个 "fused" 阶段，对每个元素依次执行；
+        filter 的条件字段都来自 map 中唯一的源字段时，把它移到该 map 之前，
+        被过滤掉的元素就不必再做映射。sort/aggregate/flatten/group 是物化阶段，
+        group 的结果是字典而不是列表，其后的步骤交给逐步处理。
+
+        Returns:
+            tuple: (阶段列表, group 之后需要逐步处理的步骤)
+        """
+        stages = []
+        ops = []
+        names = []
+
+        def close_fused():
+            if ops:
+                stages.append(TransformStage(list(names), "fused", _fused_pass(list(ops))))
+                ops.clear()
+                names.clear()
+
+        for index, transform in enumerate(transforms):
             transform_type = transform.get("type", "")
             params = transform.get("params", {})
-            
-            if transform_type == "group":
-                # 按字段分组
-                field = params.get("field")
-                if not field:
-                    continue
-                result = self._group_by_field(result, field)
-            
-            elif transform_type == "filter":
-                # 过滤数据
+
+            if transform_type == "filter":
                 condition = params.get("condition", {})
-                result = self._filter_data(result, condition)
-            
+                position = len(ops)
+                # 越过前面可以安全交换的 map
+                while position > 0 and ops[position - 1][0] == "map":
+                    rewritten = _condition_before_map(condition, ops[position - 1][1])
+                    if rewritten is None:
+                        break
+                    condition = rewritten
+                    position -= 1
+                ops.insert(position, ("filter", condition))
+                names.append(transform_type)
+
+            elif transform_type == "map":
+                ops.append(("map", params.get("mapping", {})))
+                names.append(transform_type)
+
             elif transform_type == "sort":
-                # 排序
                 field = params.get("field")
-                reverse = params.get("reverse", False)
                 if not field:
                     continue
-                result = self._sort_data(result, field, reverse)
-            
-            elif transform_type == "map":
-                # 字段映射
-                mapping = params.get("mapping", {})
-                result = self._map_fields(result, mapping)
-            
+                reverse = params.get("reverse", False)
+                close_fused()
+                stages.append(TransformStage([transform_type], "materialize",
+                                             lambda items, field=field, reverse=reverse: _sort_items(items, field, reverse)))
+
             elif transform_type == "flatten":
-                # 展平嵌套数组
-                result = self._flatten_array(result)
-            
+                close_fused()
+                stages.append(TransformStage([transform_type], "materialize", self._flatten_array_items))
+
             elif transform_type == "aggregate":
-                # 聚合计算
                 group_by = params.get("group_by")
+                if not group_by:
+                    continue
                 metrics = params.get("metrics", [])
-                result = self._aggregate_data(result, group_by, metrics)
+                close_fused()
+                stages.append(TransformStage([transform_type], "materialize",
+                                             lambda items, group_by=group_by, metrics=metrics:
+                                             self._aggregate_items(items, group_by, metrics)))
+
+            elif transform_type == "group":
+                field = params.get("field")
+                if not field:
+                    continue
+                close_fused()
+                stages.append(TransformStage([transform_type], "materialize",
+                                             lambda items, field=field: _group_items(items, field)))
+                return stages, transforms[index + 1:]
+
+        close_fused()
+        return stages, []
+
+    def _transform_steps(self, data, transforms):
+        """逐步执行转换，每一步都生成完整的结果"""
+        result = data
+        for transform in transforms:
+            transform_type = transform.get("type", "")
+            params = transform.get("params", {})
+            
+            with span(f"转换 {transform_type}"):
+                if transform_type == "group":
+                    # 按字段分组
+                    field = params.get("field")
+                    if not field:
+                        continue
+                    result = self._group_by_field(result, field)
+            
+                elif transform_type == "filter":
+                    # 过滤数据
+                    condition = params.get("condition", {})
+                    result = self._filter_data(result, condition)
+            
+                elif transform_type == "sort":
+                    # 排序
+                    field = params.get("field")
+                    reverse = params.get("reverse", False)
+                    if not field:
+                        continue
+                    result = self._sort_data(result, field, reverse)
+            
+                elif transform_type == "map":
+                    # 字段映射
+                    mapping = params.get("mapping", {})
+                    result = self._map_fields(result, mapping)
+            
+                elif transform_type == "flatten":
+                    # 展平嵌套数组
+                    result = self._flatten_array(result)
+            
+                elif transform_type == "aggregate":
+                    # 聚合计算
+                    group_by = params.get("group_by")
+                    metrics = params.get("metrics", [])
+                    result = self._aggregate_data(result, group_by, metrics)
         
         return result
 
@@ -487,73 +961,36 @@ class Converter:
         """按字段分组"""
         if not isinstance(data, list):
             return data
-        
-        groups = {}
-        for item in data:
-            key = item.get(field)
-            if key not in groups:
-                groups[key] = []
-            groups[key].append(item)
-        return groups
+        return _group_items(data, field)
 
     def _filter_data(self, data, condition):
         """过滤数据"""
         if not isinstance(data, list):
             return data
-        
-        def match_condition(item, cond):
-            for field, value in cond.items():
-                if isinstance(value, dict):
-                    # 支持运算符
-                    for op, val in value.items():
-                        if op == "eq" and item.get(field) != val:
-                            return False
-                        elif op == "ne" and item.get(field) == val:
-                            return False
-                        elif op == "gt" and not (isinstance(item.get(field), (int, float)) and item.get(field) > val):
-                            return False
-                        elif op == "lt" and not (isinstance(item.get(field), (int, float)) and item.get(field) < val):
-                            return False
-                        elif op == "in" and item.get(field) not in val:
-                            return False
-                else:
-                    # 简单相等判断
-                    if item.get(field) != value:
-                        return False
-            return True
-        
-        return [item for item in data if match_condition(item, condition)]
+        return [item for item in data if _match_condition(item, condition)]
 
     def _sort_data(self, data, field, reverse=False):
         """排序数据"""
         if not isinstance(data, list):
             return data
-        
-        return sorted(data, key=lambda x: x.get(field, ""), reverse=reverse)
+        return _sort_items(data, field, reverse)
 
     def _map_fields(self, data, mapping):
         """字段映射"""
-        if isinstance(data, list):
-            return [self._map_fields(item, mapping) for item in data]
-        
-        if isinstance(data, dict):
-            result = {}
-            for old_key, new_key in mapping.items():
-                if old_key in data:
-                    result[new_key] = data[old_key]
-            return result
-        
-        return data
+        return _map_item(data, mapping)
 
     def _flatten_array(self, data):
         """展平嵌套数组"""
         if not isinstance(data, list):
             return data
-        
+        return self._flatten_array_items(data)
+
+    def _flatten_array_items(self, items):
+        """展平可迭代对象中的嵌套数组"""
         result = []
-        for item in data:
+        for item in items:
             if isinstance(item, list):
-                result.extend(self._flatten_array(item))
+                result.extend(self._flatten_array_items(item))
             else:
                 result.append(item)
         return result
@@ -562,7 +999,10 @@ class Converter:
         """聚合计算"""
         if not isinstance(data, list) or not group_by:
             return data
-        
+        return self._aggregate_items(data, group_by, metrics)
+
+    def _aggregate_items(self, data, group_by, metrics):
+        """对可迭代对象中的元素分组聚合"""
         groups = {}
         for item in data:
             key = tuple(item.get(field) for field in group_by)
@@ -1,4 +1,198 @@
 import json
+import os
+import re
+from contextlib import contextmanager
+
+from logic.timing import span
+
+# 流式格式化每次读取的字符数
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# 字符串内部：普通字符或转义序列；块末尾单独的反斜杠留到下一块处理
+_STRING_BODY = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.S)
+# 字符串外部：空白、字符串（块末尾可能没有结束引号）、一段连续的字面量（数字、true/false/null）或结构字符
+_STRUCTURE_TOKEN = re.compile(r'''
+    (?P<space>\s+)
+  | (?P<string>"[^"\\]*(?:\\.[^"\\]*)*(?P<closed>")?)
+  | (?P<literal>[^{}\[\],:"\s]+)
+  | (?P<punct>.)
+''', re.S | re.X)
+_CLOSING = {"{": "}", "[": "]"}
+# 合法的 JSON 字面量，以及块开头延续上一块字面量的部分
+_JSON_LITERAL = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null")
+_LITERAL_PART = re.compile(r'[^{}\[\],:"\s]*')
+
+
+@contextmanager
+def _open_stream(target, mode):
+    """target 可以是文件路径，也可以是已打开的文本流（不会被关闭）"""
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, mode, encoding="utf-8", newline="") as f:
+            yield f
+    else:
+        yield target
+
+
+class _Reindenter:
+    """逐块重排 JSON 文本的状态机
+
+    只识别字符串边界和结构字符，不构造任何 Python 对象，
+    状态（是否在字符串内、嵌套深度等）跨块保存，因此内存占用与输入大小无关。
+    多个顶层文档（如 NDJSON）之间以换行分隔。
+    值与值之间缺少逗号或冒号、字面量不合法时抛出 ValueError，而不是把它们拼在一起。
+    """
+
+    def __init__(self, indent):
+        if indent is None:
+            self.item_separator = ","
+            self.key_separator = ":"
+        else:
+            self.item_separator = ","
+            self.key_separator = ": "
+        self.indent = indent
+        self._newlines = {}
+        self.in_string = False
+        self.escape = False
+        self.stack = []
+        self.pending_open = None
+        self.started = False
+        # 上一个完整的记号是否是一个值（之后只能跟 , : 或右括号）
+        self.after_value = False
+        # 块末尾的字面量可能在下一块继续，暂存到确定结束为止
+        self.literal = None
+
+    def _newline(self, depth):
+        if self.indent is None:
+            return ""
+        text = self._newlines.get(depth)
+        if text is None:
+            text = self._newlines[depth] = "\n" + " " * (self.indent * depth)
+        return text
+
+    def _begin_value(self, token, emit):
+        """一个新值开始前：检查分隔符并输出换行"""
+        if self.pending_open is not None:
+            self.pending_open = None
+            emit(self._newline(len(self.stack)))
+        elif self.after_value:
+            if self.stack:
+                raise ValueError(f"值之间缺少逗号或冒号：{token[:20]}")
+            # 顶层的新值是下一个文档
+            emit("\n")
+        self.started = True
+        self.after_value = True
+
+    def _emit_literal(self, token, emit):
+        if not _JSON_LITERAL.fullmatch(token):
+            raise ValueError(f"无法识别的值：{token[:20]}")
+        emit(token)
+
+    def feed(self, chunk):
+        """处理一块输入，返回对应的输出文本"""
+        out = []
+        emit = out.append
+        pos = 0
+        end = len(chunk)
+        if self.literal is not None:
+            pos = _LITERAL_PART.match(chunk).end()
+            self.literal += chunk[:pos]
+            if pos == end:
+                return ""
+            self._emit_literal(self.literal, emit)
+            self.literal = None
+        if self.in_string:
+            pos = self._continue_string(chunk, pos, emit)
+        while pos < end:
+            match = _STRUCTURE_TOKEN.match(chunk, pos)
+            kind = match.lastgroup
+            pos = match.end()
+            if kind == "space":
+                continue
+            token = match.group()
+
+            if kind == "literal":
+                self._begin_value(token, emit)
+                if pos == end:
+                    self.literal = token
+                else:
+                    self._emit_literal(token, emit)
+            elif kind == "string":
+                self._begin_value(token, emit)
+                emit(token)
+                if match.group("closed") is None:
+                    # 字符串跨块，剩余部分（可能以单独的反斜杠开头）按字符串内部处理
+                    self.in_string = True
+                    pos = self._continue_string(chunk, pos, emit)
+            elif token in "{[":
+                self._begin_value(token, emit)
+                emit(token)
+                self.stack.append(token)
+                self.pending_open = token
+                self.after_value = False
+            elif token in "}]":
+                if self.pending_open is not None:
+                    if token != _CLOSING[self.pending_open]:
+                        raise ValueError(f"括号不匹配：{token}")
+                    # 空容器保持 {} / [] 的写法
+                    self.stack.pop()
+                    self.pending_open = None
+                    emit(token)
+                    self.after_value = True
+                    continue
+                if not self.after_value:
+                    raise ValueError(f"{token} 之前缺少值")
+                depth = len(self.stack)
+                if not self.stack or _CLOSING[self.stack.pop()] != token:
+                    raise ValueError(f"括号不匹配：{token}")
+                emit(self._newline(depth - 1))
+                emit(token)
+            elif token == ",":
+                if not self.after_value or not self.stack:
+                    raise ValueError("多余的逗号")
+                emit(self.item_separator)
+                emit(self._newline(len(self.stack)))
+                self.after_value = False
+            elif token == ":":
+                if not self.after_value or not self.stack or self.stack[-1] != "{":
+                    raise ValueError("多余的冒号")
+                emit(self.key_separator)
+                self.after_value = False
+            else:
+                raise ValueError(f"无法识别的字符：{token!r}")
+        return "".join(out)
+
+    def _continue_string(self, chunk, pos, emit):
+        """在字符串内部继续扫描，返回字符串结束后（或块末尾）的位置"""
+        end = len(chunk)
+        while pos < end:
+            if self.escape:
+                emit(chunk[pos])
+                pos += 1
+                self.escape = False
+                continue
+            stop = _STRING_BODY.match(chunk, pos).end()
+            emit(chunk[pos:stop])
+            pos = stop
+            if pos < end:
+                emit(chunk[pos])
+                pos += 1
+                if chunk[pos - 1] == '"':
+                    self.in_string = False
+                    break
+                self.escape = True
+        return pos
+
+    def close(self):
+        out = []
+        if self.literal is not None:
+            self._emit_literal(self.literal, out.append)
+            self.literal = None
+        if self.in_string:
+            raise ValueError("字符串没有结束")
+        if self.stack:
+            raise ValueError(f"缺少 {_CLOSING[self.stack[-1]]}")
+        return "".join(out)
+
 
 class Formatter:
     def format(self, data, indent=4, sort_keys=False):
@@ -14,6 +208,39 @@ class Formatter:
     def minify(self, data):
         return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
 
+    def format_stream(self, source, target, indent=2, chunk_size=STREAM_CHUNK_SIZE):
+        """流式格式化：按块读取 JSON 文本并重新缩进后写出
+
+        只做词法层面的处理，不解析成 Python 对象，内存占用与文件大小无关。
+        输出与 json.dumps(indent=indent, ensure_ascii=False) 的排版一致，
+        字符串和数字原样保留。检查括号匹配、分隔符和字面量，但不检查键是否为字符串等更细的语法。
+
+        Args:
+            source: 输入文件路径或文本流
+            target: 输出文件路径或文本流
+            indent: 缩进空格数，None 表示压缩
+            chunk_size: 每次读取的字符数
+
+        Returns:
+            int: 写出的字符数
+        """
+        reindenter = _Reindenter(indent)
+        written = 0
+        with span("流式格式化"), _open_stream(source, "r") as src, _open_stream(target, "w") as dst:
+            while True:
+                chunk = src.read(chunk_size)
+                if not chunk:
+                    break
+                text = reindenter.feed(chunk)
+                if text:
+                    written += dst.write(text)
+            written += dst.write(reindenter.close())
+        return written
+
+    def minify_stream(self, source, target, chunk_size=STREAM_CHUNK_SIZE):
+        """流式压缩，去掉字符串外的所有空白，参数同 format_stream"""
+        return self.format_stream(source, target, indent=None, chunk_size=chunk_size)
+
     def validate(self, s):
         """验证 JSON 字符串的有效性
         
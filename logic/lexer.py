@@ -0,0 +1,71 @@
+import re
+
+HIGHLIGHT_TAGS = ("key", "string", "number", "keyword")
+
+# 一次扫描完成分类：字符串优先匹配，所以字符串里的数字和关键字不会被误标；
+# 后面紧跟冒号的字符串是对象的键
+_TOKEN_PATTERN = re.compile(r'''
+    (?P<string>"(?:[^"\\\n]|\\.)*")(?P<colon>[ \t]*:)?
+  | (?P<number>-?\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b)
+  | (?P<keyword>\b(?:true|false|null)\b)
+''', re.X)
+
+
+# 预先计算首屏高亮时最多扫描的字符数（压缩成一行的大文档只有一行）
+HEAD_MAX_CHARS = 200 * 1024
+
+
+def tokenize_highlight(text, first_line=1, first_column=0):
+    """扫描一遍 JSON 文本，按标签分组返回高亮范围
+
+    不依赖 Tk，可以在工作线程中调用。坐标按扫描进度增量换算为 Tk 的
+    "行.列" 形式，结果可以直接展开传给 text_widget.tag_add 批量添加。
+
+    Args:
+        text: 要高亮的文本片段
+        first_line: 片段第一行在文本框中的行号
+        first_column: 片段第一个字符在该行中的列号（片段从行中间开始时）
+
+    Returns:
+        dict: {标签名: [起点, 终点, 起点, 终点, ...]}
+    """
+    ranges = {tag: [] for tag in HIGHLIGHT_TAGS}
+    line = first_line
+    # 第一行的列号要加上片段起点的列偏移
+    line_start = -first_column
+    last = 0
+    for match in _TOKEN_PATTERN.finditer(text):
+        start = match.start()
+        newlines = text.count("\n", last, start)
+        if newlines:
+            line += newlines
+            line_start = text.rfind("\n", last, start) + 1
+        last = start
+
+        tag = match.lastgroup
+        if tag == "colon":
+            tag = "key"
+            end = match.end("string")
+        else:
+            end = match.end()
+        column = start - line_start
+        ranges[tag].append(f"{line}.{column}")
+        ranges[tag].append(f"{line}.{column + end - start}")
+    return ranges
+
+
+def tokenize_head(text, line_count, max_chars=HEAD_MAX_CHARS):
+    """只对文本开头的若干行（最多 max_chars 个字符）做高亮扫描，用于新内容插入前预先计算首屏高亮
+
+    Returns:
+        tuple: (起点, 终点, 范围)，起止点为 Tk 索引，可直接作为 highlight_json 的 precomputed 参数
+    """
+    end = -1
+    for _ in range(line_count):
+        end = text.find("\n", end + 1, max_chars)
+        if end < 0:
+            end = min(len(text), max_chars)
+            break
+    line = text.count("\n", 0, end) + 1
+    column = end - (text.rfind("\n", 0, end) + 1)
+    return "1.0", f"{line}.{column}", tokenize_highlight(text[:end], 1)
@@ -0,0 +1,130 @@
+import codecs
+import io
+import mmap
+import os
+import re
+from array import array
+
+from logic.parse import cached_parse_with_format
+from logic.timing import span
+
+# 超过该大小的文件以内存映射方式打开，不载入输入框
+LARGE_FILE_THRESHOLD = 8 * 1024 * 1024
+
+_NEWLINE = re.compile(b"\n")
+# 每次扩展行索引时至少向后扫描的行数
+_INDEX_STEP = 10000
+
+
+class MappedFile:
+    """以只读内存映射方式打开的文本文件
+
+    文件内容由操作系统按需换页，不会复制进 Python 堆；行起始偏移在访问时
+    增量建立，查看开头几页不需要扫描整个文件。
+    """
+
+    def __init__(self, path, encoding="utf-8"):
+        self.path = path
+        self.encoding = encoding
+        self.size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            # 空文件无法映射，用空字节串代替
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+        self._line_starts = array("q", [0])
+        self._indexed_to = 0
+        self._complete = self.size == 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def closed(self):
+        return self._buffer is None
+
+    def close(self):
+        if isinstance(self._buffer, mmap.mmap):
+            try:
+                self._buffer.close()
+            except BufferError:
+                # 后台线程仍在读取，映射会在读取结束、引用释放后自动关闭
+                pass
+        self._buffer = None
+
+    def _index_until(self, line):
+        """扩展行索引，直到已知第 line 行（从 0 开始）的起始偏移或到达文件末尾"""
+        starts = self._line_starts
+        while not self._complete and len(starts) <= line:
+            target = max(line + 1, len(starts) + _INDEX_STEP)
+            for match in _NEWLINE.finditer(self._buffer, self._indexed_to):
+                end = match.end()
+                self._indexed_to = end
+                if end < self.size:
+                    starts.append(end)
+                if len(starts) > target:
+                    break
+            else:
+                self._indexed_to = self.size
+                self._complete = True
+
+    @property
+    def index_complete(self):
+        return self._complete
+
+    @property
+    def line_count(self):
+        """总行数，第一次访问时会扫描完整个文件"""
+        self._index_until(float("inf"))
+        return len(self._line_starts)
+
+    def read_lines(self, first, count, max_bytes=1024 * 1024):
+        """读取从第 first 行（从 0 开始）起的 count 行文本
+
+        Args:
+            first: 起始行
+            count: 行数
+            max_bytes: 最多读取的字节数，超长的行（如压缩后的 JSON）会被截断
+
+        Returns:
+            tuple: (文本, 实际读取的行数, 是否被截断)
+        """
+        self._index_until(first + count)
+        starts = self._line_starts
+        if first >= len(starts):
+            return "", 0, False
+        last = min(first + count, len(starts))
+        start = starts[first]
+        end = starts[last] if last < len(starts) else self.size
+        truncated = end - start > max_bytes
+        if truncated:
+            end = start + max_bytes
+        data = self._buffer[start:end]
+        return data.decode(self.encoding, errors="replace"), last - first, truncated
+
+    def read_text(self):
+        """把整个文件解码为字符串（直接从映射区解码，不经过中间的 bytes 副本）"""
+        with memoryview(self._buffer) as view:
+            return str(view, self.encoding)
+
+    def open_text(self):
+        """以文本流方式逐块读取映射内容，供流式格式化等场景使用"""
+        if not self.size:
+            return io.StringIO("")
+        self._buffer.seek(0)
+        return codecs.getreader(self.encoding)(self._buffer)
+
+    def parse(self, parser=cached_parse_with_format):
+        """自动识别格式并解析整个文件
+
+        Args:
+            parser: 解析函数 parser(text)，返回 ParseResult；默认走解析缓存，
+                界面中应传入 ParserPool.parse_with_format，使大文件同样受时间和内存预算约束
+
+        Returns:
+            ParseResult: (解析结果, 格式, 置信度)
+        """
+        with span("解码映射文件"):
+            text = self.read_text()
+        return parser(text)
@@ -0,0 +1,43 @@
+import json
+import re
+
+# 与 json 模块内部一致的空白定义
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_decoder = json.JSONDecoder()
+
+
+def iter_json_documents(text, decoder=None):
+    """逐个产出文本中的顶层 JSON 值
+
+    基于 JSONDecoder.raw_decode 增量解析，支持 NDJSON、首尾相接的 JSON
+    以及以任意空白分隔的多个值。值是惰性产出的，调用方可以边解析边处理。
+
+    Args:
+        text: 输入文本
+        decoder: 自定义的 JSONDecoder，默认使用标准解码器
+
+    Raises:
+        json.JSONDecodeError: 某个值不是合法 JSON 时抛出，位置为全文中的偏移
+    """
+    decoder = decoder or _decoder
+    end = len(text)
+    pos = _WHITESPACE.match(text, 0).end()
+    while pos < end:
+        value, pos = decoder.raw_decode(text, pos)
+        yield value
+        pos = _WHITESPACE.match(text, pos).end()
+
+
+def decode_documents(text):
+    """解析一个或多个 JSON 值
+
+    Returns:
+        只有一个值时直接返回该值，否则返回所有值组成的列表
+    """
+    documents = iter_json_documents(text)
+    first = next(documents, None)
+    rest = list(documents)
+    if not rest:
+        return first
+    rest.insert(0, first)
+    return rest
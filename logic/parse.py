@@ -0,0 +1,243 @@
+import ast
+import csv
+import io
+import re
+from collections import namedtuple
+
+from logic.cache import ParseCache
+from logic.converter import Converter
+from logic.multidoc import decode_documents
+from logic.timing import span
+
+converter = Converter()
+
+# 支持识别的输入格式
+FORMAT_JSON = "json"
+FORMAT_NDJSON = "ndjson"
+FORMAT_JAVASCRIPT = "javascript"
+FORMAT_PYTHON = "python"
+FORMAT_YAML = "yaml"
+FORMAT_XML = "xml"
+FORMAT_CSV = "csv"
+FORMAT_TSV = "tsv"
+FORMAT_URL = "url"
+
+# 只在前 64KB 上做统计，避免大文件探测本身成为瓶颈
+SNIFF_SAMPLE_SIZE = 64 * 1024
+SNIFF_MAX_LINES = 20
+
+
+class ParseAborted(ValueError):
+    """解析被强制中止（超时、超内存等），不再尝试其他解析器"""
+
+
+Detection = namedtuple("Detection", ["format", "confidence"])
+ParseResult = namedtuple("ParseResult", ["data", "format", "confidence"])
+
+_PYTHON_HINT = re.compile(r"\b(True|False|None)\b|[\[{,:]\s*'")
+_JS_HINT = re.compile(r"[{,]\s*[A-Za-z_$][\w$]*\s*:|,\s*[}\]]|^\s*//|/\*", re.M)
+_URL_PATTERN = re.compile(r"^\??[^=&\s]+=[^&\s]*(&[^=&\s]+=[^&\s]*)*$")
+_YAML_LINE = re.compile(r"^\s*(-\s+\S|-$|[^\s:#][^:]*:(\s|$))")
+# 双引号字符串（样本末尾可能截断在字符串中间），探测结构特征前替换为空字符串
+_DOUBLE_QUOTED = re.compile(r'"(?:[^"\\]|\\.)*(?:"|$)')
+# 两个顶层值之间没有逗号，只可能是 NDJSON / 拼接 JSON
+_MULTI_DOC_HINT = re.compile(r"[}\]]\s*[{\[]")
+_JSON_SCALAR = re.compile(r'^(-?\d+(\.\d+)?([eE][+-]?\d+)?|true|false|null|".*")$', re.S)
+_JSON_SCALAR_SEQUENCE = re.compile(
+    r'^(-?\d+(\.\d+)?([eE][+-]?\d+)?|true|false|null|"(?:[^"\\]|\\.)*")'
+    r'(\s+(-?\d+(\.\d+)?([eE][+-]?\d+)?|true|false|null|"(?:[^"\\]|\\.)*"))+\s*$')
+
+
+def _delimiter_consistency(lines, delimiter):
+    """返回各行分隔符数量一致的比例，首行不含分隔符时返回 0"""
+    counts = [line.count(delimiter) for line in lines if line.strip()]
+    if not counts or counts[0] == 0:
+        return 0.0
+    return sum(1 for c in counts if c == counts[0]) / len(counts)
+
+
+def detect_format(raw_text):
+    """单次扫描推测输入格式
+
+    依据首字符、括号配平情况以及制表符/逗号/等号的密度判断格式，
+    只看前 SNIFF_SAMPLE_SIZE 个字符（括号计数使用全文的 str.count，代价很小）。
+
+    Returns:
+        Detection: (格式名, 置信度 0~1)，无法判断时格式为 None
+    """
+    text = raw_text.strip()
+    if not text:
+        return Detection(None, 0.0)
+
+    sample = text[:SNIFF_SAMPLE_SIZE]
+    first = text[0]
+
+    if first == "<":
+        return Detection(FORMAT_XML, 0.95 if text.endswith(">") else 0.6)
+
+    if first in "{[":
+        balanced = (text.count("{") == text.count("}")
+                    and text.count("[") == text.count("]"))
+        confidence = 0.9 if balanced else 0.5
+        # 字符串内容（如 "None"、", status:"）不能作为格式特征，否则合法 JSON 会被交给慢得多的解析器
+        structure = _DOUBLE_QUOTED.sub('""', sample)
+        if _MULTI_DOC_HINT.search(structure):
+            return Detection(FORMAT_NDJSON, confidence)
+        if _JS_HINT.search(structure):
+            return Detection(FORMAT_JAVASCRIPT, confidence * 0.9)
+        if _PYTHON_HINT.search(structure):
+            return Detection(FORMAT_PYTHON, confidence * 0.9)
+        return Detection(FORMAT_JSON, confidence)
+
+    if _JSON_SCALAR.match(text):
+        return Detection(FORMAT_JSON, 0.8)
+    if _JSON_SCALAR_SEQUENCE.match(sample):
+        return Detection(FORMAT_NDJSON, 0.7)
+
+    lines = sample.split("\n", SNIFF_MAX_LINES)[:SNIFF_MAX_LINES]
+    if len(lines) > 1:
+        tab_ratio = _delimiter_consistency(lines, "\t")
+        if tab_ratio >= 0.8:
+            return Detection(FORMAT_TSV, tab_ratio * 0.95)
+        yaml_ratio = sum(1 for line in lines if _YAML_LINE.match(line)) / len(lines)
+        if yaml_ratio >= 0.8:
+            return Detection(FORMAT_YAML, yaml_ratio * 0.9)
+        comma_ratio = _delimiter_consistency(lines, ",")
+        if comma_ratio >= 0.8:
+            return Detection(FORMAT_CSV, comma_ratio * 0.9)
+        if yaml_ratio > 0:
+            return Detection(FORMAT_YAML, yaml_ratio * 0.6)
+        return Detection(None, 0.0)
+
+    if "=" in sample:
+        if _URL_PATTERN.match(text):
+            return Detection(FORMAT_URL, 0.95)
+        return Detection(FORMAT_URL, 0.4)
+
+    if _YAML_LINE.match(text):
+        return Detection(FORMAT_YAML, 0.6)
+
+    return Detection(None, 0.0)
+
+
+def _parse_json(text):
+    # 单个值时与 json.loads 等价；样本之外才出现的多个值也能一次解析完
+    return decode_documents(text)
+
+
+def _parse_javascript(text):
+    import demjson3
+    return demjson3.decode(text)
+
+
+def _parse_python(text):
+    return ast.literal_eval(text)
+
+
+def _parse_yaml(text):
+    import yaml
+    return yaml.safe_load(text)
+
+
+def _parse_xml(text):
+    import xmltodict
+    return xmltodict.parse(text)
+
+
+def _parse_csv(text):
+    return converter.csv_to_json(text)
+
+
+def _parse_tsv(text):
+    return list(csv.DictReader(io.StringIO(text), delimiter="\t"))
+
+
+def _parse_url(text):
+    data = converter.url_to_json(text.lstrip("?"))
+    if not data:
+        raise ValueError("不是合法的 URL 参数")
+    return data
+
+
+PARSERS = {
+    FORMAT_JSON: _parse_json,
+    FORMAT_NDJSON: _parse_json,
+    FORMAT_JAVASCRIPT: _parse_javascript,
+    FORMAT_PYTHON: _parse_python,
+    FORMAT_YAML: _parse_yaml,
+    FORMAT_XML: _parse_xml,
+    FORMAT_CSV: _parse_csv,
+    FORMAT_TSV: _parse_tsv,
+    FORMAT_URL: _parse_url,
+}
+
+# 每种格式探测失败后只再尝试一个代价较低的备选解析器
+FALLBACKS = {
+    FORMAT_JSON: FORMAT_JAVASCRIPT,
+    FORMAT_NDJSON: FORMAT_JAVASCRIPT,
+    FORMAT_JAVASCRIPT: FORMAT_YAML,
+    FORMAT_PYTHON: FORMAT_JAVASCRIPT,
+    FORMAT_YAML: FORMAT_CSV,
+    FORMAT_XML: None,
+    FORMAT_CSV: FORMAT_YAML,
+    FORMAT_TSV: FORMAT_CSV,
+    FORMAT_URL: FORMAT_YAML,
+}
+
+
+def run_parser(fmt, text):
+    """用指定格式的解析器解析文本"""
+    return PARSERS[fmt](text)
+
+
+def parse_with_format(raw_text, runner=run_parser):
+    """先探测格式，再交给对应的解析器（失败时只尝试一个备选）
+
+    Args:
+        raw_text: 输入文本
+        runner: 执行单次解析尝试的函数 runner(fmt, text)，
+            默认在当前进程内直接解析，ParserPool 会替换为进程池版本
+
+    Returns:
+        ParseResult: (解析结果, 实际使用的格式, 置信度)
+    """
+    text = raw_text.strip()
+    with span("探测格式"):
+        fmt, confidence = detect_format(text)
+    if fmt is None:
+        raise ValueError("无法识别输入格式")
+
+    try:
+        with span(f"解析 {fmt}"):
+            return ParseResult(runner(fmt, text), fmt, confidence)
+    except ParseAborted:
+        raise
+    except Exception as e:
+        error = e
+
+    fallback = FALLBACKS.get(fmt)
+    if fallback:
+        try:
+            # 备选解析器成功时置信度减半，提示用户这只是兜底结果
+            with span(f"解析 {fallback}"):
+                return ParseResult(runner(fallback, text), fallback, confidence / 2)
+        except ParseAborted:
+            raise
+        except Exception:
+            pass
+
+    raise ValueError(f"无法识别输入格式（推测为 {fmt}）：{error}")
+
+
+# 解析结果缓存；超时等预算中止与内容本身无关，不做失败缓存
+parse_cache = ParseCache(skip=(ParseAborted,))
+
+
+def cached_parse_with_format(raw_text, runner=run_parser):
+    """带内容哈希缓存的 parse_with_format，重复的输入不再重新探测和解析"""
+    return parse_cache.get_or_parse(raw_text, lambda text: parse_with_format(text, runner))
+
+
+def auto_parse(raw_text):
+    """自动识别格式并解析，返回解析后的数据"""
+    return cached_parse_with_format(raw_text).data
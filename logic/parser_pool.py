@@ -0,0 +1,213 @@
+import multiprocessing
+import os
+import re
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from logic.parse import (
+    FORMAT_JAVASCRIPT,
+    FORMAT_PYTHON,
+    FORMAT_XML,
+    FORMAT_YAML,
+    ParseAborted,
+    cached_parse_with_format,
+    run_parser,
+)
+
+# 这些解析器是纯 Python 实现，遇到恶意或超大输入时最容易卡死
+SLOW_FORMATS = (FORMAT_JAVASCRIPT, FORMAT_PYTHON, FORMAT_YAML)
+# 纯 Python 递归解析、以括号表示嵌套的格式，解析前先检查嵌套深度
+# （json 的 C 解析器遇到过深嵌套会自己抛出 RecursionError，不需要预先扫描）
+_BRACKET_FORMATS = (FORMAT_JAVASCRIPT, FORMAT_PYTHON)
+# 超过该长度的 XML 放到子进程中解析（防范实体膨胀等恶意输入）
+OUT_OF_PROCESS_THRESHOLD = 64 * 1024
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_RSS = 1024 * 1024 * 1024
+DEFAULT_MAX_DEPTH = 512
+
+# 子进程自身的超时信号与父进程强杀之间的宽限时间
+_KILL_GRACE = 1.0
+_WATCH_INTERVAL = 0.05
+
+_NESTING_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|[\[\]{}]')
+
+
+class ParseBudgetExceeded(ParseAborted):
+    """解析尝试超出了时间、内存或嵌套深度预算"""
+
+    def __init__(self, fmt, reason):
+        super().__init__(f"{fmt} 解析已中止：{reason}")
+        self.format = fmt
+        self.reason = reason
+
+    def __reduce__(self):
+        return (self.__class__, (self.format, self.reason))
+
+
+def nesting_depth(text, limit=None):
+    """计算括号嵌套深度（忽略字符串中的括号），超过 limit 时提前返回"""
+    depth = max_depth = 0
+    for match in _NESTING_TOKEN.finditer(text):
+        token = match.group()
+        if token in "[{":
+            depth += 1
+            if depth > max_depth:
+                max_depth = depth
+                if limit is not None and depth > limit:
+                    return depth
+        elif token in "]}":
+            depth -= 1
+    return max_depth
+
+
+def _init_worker(max_rss, max_depth):
+    """子进程初始化：设置内存上限、递归上限，并预先导入解析依赖"""
+    try:
+        import resource
+        # RLIMIT_AS 限制的是虚拟内存，作为父进程 RSS 监控之外的兜底
+        limit = max_rss * 2
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError):
+        pass
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), max_depth * 8))
+    for module in ("yaml", "demjson3", "xmltodict"):
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+
+
+def _warm_up():
+    return os.getpid()
+
+
+def _on_alarm(signum, frame):
+    raise TimeoutError
+
+
+def _run_attempt(fmt, text, timeout, max_depth):
+    """在子进程中执行一次解析尝试"""
+    if fmt in _BRACKET_FORMATS and nesting_depth(text, max_depth) > max_depth:
+        raise ParseBudgetExceeded(fmt, f"嵌套深度超过 {max_depth}")
+    has_alarm = hasattr(signal, "setitimer")
+    if has_alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return run_parser(fmt, text)
+    except TimeoutError:
+        raise ParseBudgetExceeded(fmt, f"超过 {timeout:g} 秒")
+    except MemoryError:
+        raise ParseBudgetExceeded(fmt, "内存不足")
+    except RecursionError:
+        raise ParseBudgetExceeded(fmt, f"嵌套深度超过 {max_depth}")
+    finally:
+        if has_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _process_rss(pid):
+    """读取 /proc 中的常驻内存大小，不支持的平台返回 0"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0
+
+
+class ParserPool:
+    """预热的解析子进程池，为每次解析尝试设置时间、内存和嵌套深度预算
+
+    慢速解析器（demjson3、ast.literal_eval、yaml）和大的 XML 会被送到子进程执行，
+    超出预算的子进程会被强制结束并重建，调用方收到 ParseBudgetExceeded。
+    json/ndjson/csv/tsv/url 的解析器足够快，任何大小都直接在当前进程解析，省去两次 pickle。
+
+    子进程解析按调用顺序逐个执行：预览线程和主线程共用同一个池时，
+    一方超时重建子进程不会中止另一方的任务，时间预算也从任务真正开始执行时计算。
+    """
+
+    def __init__(self, workers=1, timeout=DEFAULT_TIMEOUT, max_rss=DEFAULT_MAX_RSS,
+                 max_depth=DEFAULT_MAX_DEPTH):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_rss = max_rss
+        self.max_depth = max_depth
+        self._executor = None
+        self._lock = threading.Lock()
+        self._start()
+
+    def _start(self):
+        # 使用 spawn，避免 fork 出带有 Tk 状态和其他线程的子进程
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.max_rss, self.max_depth),
+        )
+        # 提前拉起子进程，不等待其完成
+        for _ in range(self.workers):
+            self._executor.submit(_warm_up)
+
+    def _kill(self):
+        # ProcessPoolExecutor 没有提供终止正在运行任务的接口，只能直接结束子进程
+        processes = list((self._executor._processes or {}).values())
+        for process in processes:
+            process.kill()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def restart(self):
+        self._kill()
+        self._start()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._kill()
+            self._executor = None
+
+    def _peak_rss(self):
+        processes = (self._executor._processes or {}).values()
+        return max((_process_rss(p.pid) for p in processes), default=0)
+
+    def run_attempt(self, fmt, text):
+        """执行一次解析尝试，快速解析器和小的 XML 直接在当前进程运行"""
+        if fmt not in SLOW_FORMATS and (fmt != FORMAT_XML or len(text) < OUT_OF_PROCESS_THRESHOLD):
+            return run_parser(fmt, text)
+
+        with self._lock:
+            return self._run_in_worker(fmt, text)
+
+    def _run_in_worker(self, fmt, text):
+        future = self._executor.submit(_run_attempt, fmt, text, self.timeout, self.max_depth)
+        # 子进程刚重建时任务要等预热完成，超时从任务开始执行时计算
+        deadline = None
+        while True:
+            done, _ = wait([future], timeout=_WATCH_INTERVAL, return_when=FIRST_COMPLETED)
+            if done:
+                break
+            if deadline is None:
+                if future.running():
+                    deadline = time.monotonic() + self.timeout + _KILL_GRACE
+            elif time.monotonic() > deadline:
+                self.restart()
+                raise ParseBudgetExceeded(fmt, f"超过 {self.timeout:g} 秒，子进程已被结束")
+            if self._peak_rss() > self.max_rss:
+                self.restart()
+                raise ParseBudgetExceeded(fmt, f"内存超过 {self.max_rss // (1024 * 1024)} MB，子进程已被结束")
+
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            self.restart()
+            raise ParseBudgetExceeded(fmt, "解析子进程异常退出")
+
+    def parse_with_format(self, raw_text):
+        """与 logic.parse.parse_with_format 相同，但每次尝试都受预算约束，结果同样走解析缓存"""
+        return cached_parse_with_format(raw_text, runner=self.run_attempt)
+
+    def auto_parse(self, raw_text):
+        return self.parse_with_format(raw_text).data
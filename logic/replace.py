@@ -0,0 +1,164 @@
+import re
+
+from logic.timing import span
+
+# 替换范围
+SCOPE_VALUES = "values"
+SCOPE_KEYS = "keys"
+SCOPE_ALL = "all"
+
+
+def _compile(find, regex=False, case_sensitive=False):
+    flags = 0 if case_sensitive else re.IGNORECASE
+    return re.compile(find if regex else re.escape(find), flags)
+
+
+def _replace_node(value, pattern, replacement, scope):
+    """递归替换，返回 (新值, 替换次数)
+
+    没有发生替换的子树原样返回，不做复制，因此解析结果可以被安全地共享。
+    """
+    if isinstance(value, dict):
+        changed = False
+        count = 0
+        result = {}
+        for key, child in value.items():
+            new_key = key
+            if scope != SCOPE_VALUES and isinstance(key, str):
+                replaced_key, n = pattern.subn(replacement, key)
+                if n:
+                    new_key = replaced_key
+                    count += n
+                    changed = True
+            new_child, n = _replace_node(child, pattern, replacement, scope)
+            count += n
+            changed = changed or new_child is not child
+            result[new_key] = new_child
+        return (result if changed else value), count
+    if isinstance(value, list):
+        changed = False
+        count = 0
+        result = []
+        for child in value:
+            new_child, n = _replace_node(child, pattern, replacement, scope)
+            count += n
+            changed = changed or new_child is not child
+            result.append(new_child)
+        return (result if changed else value), count
+    if scope != SCOPE_KEYS and isinstance(value, str):
+        new_value, n = pattern.subn(replacement, value)
+        return (new_value if n else value), n
+    return value, 0
+
+
+def _literal_replacement(replacement, regex):
+    if regex:
+        return replacement
+    # 普通文本替换时，replacement 中的反斜杠不应被当作转义
+    return lambda match: replacement
+
+
+def replace_in_text(text, find, replacement, regex=False, case_sensitive=False):
+    """纯文本替换，选项与 replace_in_data 相同
+
+    Returns:
+        tuple: (替换后的文本, 替换次数)
+    """
+    pattern = _compile(find, regex, case_sensitive)
+    return pattern.subn(_literal_replacement(replacement, regex), text)
+
+
+def replace_in_data(data, find, replacement, scope=SCOPE_VALUES, jsonpath=None,
+                    regex=False, case_sensitive=False):
+    """在解析后的数据上做结构化替换，只改动键名或字符串值，不会破坏 JSON 语法
+
+    Args:
+        data: 解析后的数据，不会被修改
+        find: 要查找的文本或正则
+        replacement: 替换文本（正则模式下支持 \\1 等反向引用）
+        scope: SCOPE_VALUES 仅值、SCOPE_KEYS 仅键、SCOPE_ALL 键和值
+        jsonpath: 只在该 JSONPath 表达式匹配到的子树中替换
+        regex: find 是否为正则表达式
+        case_sensitive: 是否区分大小写
+
+    Returns:
+        tuple: (替换后的数据, 替换次数)
+    """
+    pattern = _compile(find, regex, case_sensitive)
+    replacement = _literal_replacement(replacement, regex)
+    if not jsonpath:
+        with span("结构化替换"):
+            return _replace_node(data, pattern, replacement, scope)
+
+    from jsonpath_ng import parse as jsonpath_parse
+    with span("JSONPath 查询"):
+        matches = jsonpath_parse(jsonpath).find(data)
+    # 匹配到的容器；祖先已经被匹配的节点（如 $..* 中的子节点）已随祖先一起替换，跳过以免重复计数
+    matched = {id(match.value) for match in matches if isinstance(match.value, (dict, list))}
+    total = 0
+    copies = {}
+    result = data
+    for match in matches:
+        if _has_matched_ancestor(match, matched):
+            continue
+        with span("结构化替换"):
+            new_value, count = _replace_node(match.value, pattern, replacement, scope)
+        if not count:
+            continue
+        total += count
+        result = _set_in_copy(data, match, new_value, copies)
+    return result, total
+
+
+def _has_matched_ancestor(match, matched):
+    context = match.context
+    while context is not None:
+        if id(context.value) in matched:
+            return True
+        context = context.context
+    return False
+
+
+def _step_key(datum, parent):
+    """datum 在父容器中的键或下标"""
+    path = datum.path
+    fields = getattr(path, "fields", None)
+    if isinstance(parent, dict) and fields is not None and len(fields) == 1 and fields[0] in parent:
+        return fields[0]
+    index = getattr(path, "index", None)
+    if index is None:
+        indices = getattr(path, "indices", None)
+        if indices is not None and len(indices) == 1:
+            index = indices[0]
+    if isinstance(parent, list) and isinstance(index, int):
+        return index
+    # 其他路径形式按对象身份在父容器中查找
+    items = parent.items() if isinstance(parent, dict) else enumerate(parent)
+    for key, value in items:
+        if value is datum.value:
+            return key
+    raise ValueError(f"无法定位 JSONPath 匹配：{datum.full_path}")
+
+
+def _set_in_copy(data, match, new_value, copies):
+    """把 match 处的值换成 new_value，只复制从根到该处路径上的容器（copies 记录已复制的容器）
+
+    Returns:
+        替换后的根
+    """
+    child = match
+    value = new_value
+    while child.context is not None:
+        parent = child.context.value
+        key = _step_key(child, parent)
+        existing = copies.get(id(parent))
+        if existing is None:
+            existing = copies[id(parent)] = dict(parent) if isinstance(parent, dict) else list(parent)
+            existing[key] = value
+            value = existing
+            child = child.context
+            continue
+        # 父容器已经复制过，它与根之间的路径也已经接好
+        existing[key] = value
+        return copies.get(id(data), data)
+    return value
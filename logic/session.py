@@ -0,0 +1,103 @@
+import json
+
+from logic.timing import span
+
+
+class DocumentSession:
+    """当前文档的共享状态：输入只解析一次，各面板和操作都从这里读取
+
+    - source_text / data / format / confidence：输入区文本及其解析结果，
+      只有输入文本变化时才需要重新解析
+    - output：输出区当前展示的数据（转换、JSONPath、替换等操作的结果），
+      默认与 data 相同
+    - version：任何一项变化都会递增，用于判断缓存和后台结果是否过期
+    - placeholder：数据过大没有展开到输出区时显示的说明文字，
+      输出区仍是这段文字时同样视为“输出区对应当前输出数据”
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.source_text = None
+        self.data = None
+        self.format = None
+        self.confidence = 0.0
+        self.output = None
+        self._has_output = False
+        self.version = getattr(self, "version", 0) + 1
+        self._rendered = {}
+        self.placeholder = None
+        self.display_indent = 2
+
+    def is_current(self, text):
+        """输入文本是否就是当前会话解析过的文本"""
+        return self.source_text is not None and text == self.source_text
+
+    def load(self, text, data, fmt=None, confidence=1.0, rendered=None, placeholder=None):
+        """记录输入文本的解析结果，同时把它作为输出数据"""
+        self.source_text = text
+        self.data = data
+        self.format = fmt
+        self.confidence = confidence
+        self.set_output(data, rendered, placeholder)
+
+    def set_output(self, data, rendered=None, placeholder=None):
+        """更新输出数据
+
+        Args:
+            data: 新的输出数据
+            rendered: 已经生成好的 2 空格缩进文本，传入时直接放入缓存
+            placeholder: 输出区显示的占位说明（数据没有展开时）
+        """
+        self.output = data
+        self._has_output = True
+        self.version += 1
+        self._rendered = {}
+        self.placeholder = placeholder
+        self.display_indent = 2
+        if rendered is not None:
+            self._rendered[2] = rendered
+
+    def set_placeholder(self, text):
+        """输出区改为显示 text（如被截断的渲染结果），输出数据本身不变"""
+        self.placeholder = text
+
+    @property
+    def has_output(self):
+        return self._has_output
+
+    def is_rendered(self, text):
+        """text 是否是输出数据某个已缓存的渲染结果（或占位说明），即输出区没有被其他内容替换或手动修改"""
+        if not self._has_output:
+            return False
+        if self.placeholder is not None and text == self.placeholder:
+            return True
+        return any(text == rendered for rendered in self._rendered.values())
+
+    def render(self, indent=2):
+        """把输出数据序列化为文本，结果按缩进缓存；indent 为 None 时生成压缩格式"""
+        text = self._rendered.get(indent)
+        if text is None:
+            with span("序列化"):
+                text = self._dump(indent)
+            self._rendered[indent] = text
+        return text
+
+    def _dump(self, indent):
+        if indent is None:
+            return json.dumps(self.output, separators=(',', ':'), ensure_ascii=False)
+        return json.dumps(self.output, indent=indent, ensure_ascii=False)
+
+    def write_output(self, stream, indent=2):
+        """把输出数据写入文本流；没有现成的渲染结果时边序列化边写出，不生成完整字符串"""
+        text = self._rendered.get(indent)
+        if text is not None:
+            stream.write(text)
+            return
+        if indent is None:
+            encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+        else:
+            encoder = json.JSONEncoder(indent=indent, ensure_ascii=False)
+        for chunk in encoder.iterencode(self.output):
+            stream.write(chunk)
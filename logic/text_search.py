@@ -0,0 +1,84 @@
+import bisect
+import re
+from array import array
+
+
+class MatchIndex:
+    """一次扫描建立的匹配位置索引
+
+    在 Python 侧对全文做一次查找，记录所有匹配的起止偏移和每行的起始偏移。
+    之后的计数、上一个/下一个跳转都只是对有序数组做二分查找，
+    不再需要反复调用 Text.search。
+    """
+
+    def __init__(self, text, keyword, regex=False, case_sensitive=False):
+        self.keyword = keyword
+        self.regex = regex
+        self.case_sensitive = case_sensitive
+        flags = 0 if case_sensitive else re.IGNORECASE
+        pattern = re.compile(keyword if regex else re.escape(keyword), flags)
+
+        self.starts = array("q")
+        self.ends = array("q")
+        for match in pattern.finditer(text):
+            # 零宽匹配（如 ^、\b）无法高亮也无法跳转，直接忽略
+            if match.end() > match.start():
+                self.starts.append(match.start())
+                self.ends.append(match.end())
+
+        self.line_starts = array("q", [0])
+        self.line_starts.extend(m.end() for m in re.finditer("\n", text))
+
+    def __len__(self):
+        return len(self.starts)
+
+    def matches(self, keyword, regex, case_sensitive):
+        return (self.keyword, self.regex, self.case_sensitive) == (keyword, regex, case_sensitive)
+
+    def to_index(self, offset):
+        """字符偏移 -> Tk 的 "行.列" 坐标"""
+        line = bisect.bisect_right(self.line_starts, offset) - 1
+        return f"{line + 1}.{offset - self.line_starts[line]}"
+
+    def to_offset(self, index):
+        """Tk 的 "行.列" 坐标 -> 字符偏移"""
+        line, column = (int(part) for part in index.split("."))
+        line = min(max(line, 1), len(self.line_starts))
+        return self.line_starts[line - 1] + column
+
+    def span(self, i):
+        """第 i 个匹配的 Tk 坐标 (起点, 终点)"""
+        return self.to_index(self.starts[i]), self.to_index(self.ends[i])
+
+    def tk_ranges(self):
+        """所有匹配的 Tk 坐标，按 [起点, 终点, 起点, 终点, ...] 展开"""
+        # 匹配本身是有序的，行号只需随之前进，不必每次二分
+        ranges = []
+        line_starts = self.line_starts
+        line_count = len(line_starts)
+        line = 0
+        for offset in _interleave(self.starts, self.ends):
+            while line + 1 < line_count and line_starts[line + 1] <= offset:
+                line += 1
+            ranges.append(f"{line + 1}.{offset - line_starts[line]}")
+        return ranges
+
+    def next_after(self, offset):
+        """起点在 offset 之后的第一个匹配序号，到末尾时回到第一个"""
+        if not self.starts:
+            return None
+        i = bisect.bisect_right(self.starts, offset)
+        return i if i < len(self.starts) else 0
+
+    def previous_before(self, offset):
+        """起点在 offset 之前的最后一个匹配序号，到开头时回到最后一个"""
+        if not self.starts:
+            return None
+        i = bisect.bisect_left(self.starts, offset) - 1
+        return i if i >= 0 else len(self.starts) - 1
+
+
+def _interleave(starts, ends):
+    for start, end in zip(starts, ends):
+        yield start
+        yield end
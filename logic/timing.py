@@ -0,0 +1,190 @@
+import contextvars
+import datetime
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows 没有 resource 模块，只记录耗时
+    resource = None
+
+# 设置该环境变量为文件路径后，每个操作的耗时明细以 JSON 行写入该文件
+LOG_ENV_VAR = "JSON_TOOL_TIMING_LOG"
+
+_current = contextvars.ContextVar("timing_operation", default=None)
+_depth = contextvars.ContextVar("timing_depth", default=0)
+
+_listeners = []
+_last = None
+_logger = None
+_logger_lock = threading.Lock()
+
+
+def peak_rss():
+    """进程的内存占用峰值（字节），无法获取时返回 None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 以 KB 为单位，macOS 以字节为单位
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Span:
+    __slots__ = ("name", "depth", "offset", "seconds", "peak_growth")
+
+    def __init__(self, name, depth, offset, seconds, peak_growth):
+        self.name = name
+        self.depth = depth
+        self.offset = offset
+        self.seconds = seconds
+        self.peak_growth = peak_growth
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "depth": self.depth,
+            "offset_ms": round(self.offset * 1000, 3),
+            "ms": round(self.seconds * 1000, 3),
+            "peak_growth_mb": None if self.peak_growth is None else round(self.peak_growth / 2 ** 20, 3),
+        }
+
+
+class Operation:
+    """一次用户操作的耗时记录，由若干阶段（span）组成
+
+    通过 active() 设为当前操作后，logic/ 中各处的 span() 会把阶段耗时记到这里；
+    提交到 BackgroundWorker 的任务会继承当前操作，因此后台解析的阶段也会被计入。
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.started_at = datetime.datetime.now()
+        self.spans = []
+        self.seconds = None
+        self.peak_rss = None
+        self._start = time.perf_counter()
+        self._start_peak = peak_rss()
+
+    @contextmanager
+    def active(self):
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    def finish(self):
+        """结束操作：记录总耗时，通知状态栏并写日志"""
+        global _last
+        if self.seconds is not None:
+            return
+        self.seconds = time.perf_counter() - self._start
+        self.peak_rss = peak_rss()
+        _last = self
+        for listener in list(_listeners):
+            listener(self)
+        _log(self)
+
+    @property
+    def peak_growth(self):
+        if self.peak_rss is None or self._start_peak is None:
+            return None
+        return self.peak_rss - self._start_peak
+
+    def summary(self):
+        """状态栏使用的一行摘要：总耗时、各顶层阶段耗时和峰值内存增长"""
+        parts = [f"{self.name} {self.seconds * 1000:.0f} ms"]
+        stages = [f"{span.name} {span.seconds * 1000:.0f} ms"
+                  for span in sorted(self.spans, key=lambda span: span.offset) if span.depth == 0]
+        if stages:
+            parts.append(" · ".join(stages))
+        growth = self.peak_growth
+        if growth:
+            parts.append(f"峰值内存 +{growth / 2 ** 20:.1f} MB")
+        return "｜".join(parts)
+
+    def to_dict(self):
+        growth = self.peak_growth
+        return {
+            "operation": self.name,
+            "started_at": self.started_at.isoformat(timespec="milliseconds"),
+            "ms": round(self.seconds * 1000, 3),
+            "peak_rss_mb": None if self.peak_rss is None else round(self.peak_rss / 2 ** 20, 3),
+            "peak_growth_mb": None if growth is None else round(growth / 2 ** 20, 3),
+            # 阶段在结束时才被记录，按开始时间排序后更容易阅读
+            "spans": [span.to_dict() for span in sorted(self.spans, key=lambda span: span.offset)],
+        }
+
+
+@contextmanager
+def operation(name):
+    """把代码块作为一次完整操作计时，结束时自动 finish"""
+    op = Operation(name)
+    try:
+        with op.active():
+            yield op
+    finally:
+        op.finish()
+
+
+@contextmanager
+def span(name):
+    """记录当前操作中的一个阶段；没有进行中的操作时几乎没有开销"""
+    op = _current.get()
+    if op is None:
+        yield
+        return
+    depth = _depth.get()
+    token = _depth.set(depth + 1)
+    start_peak = peak_rss()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        _depth.reset(token)
+        end_peak = peak_rss()
+        growth = None if start_peak is None else end_peak - start_peak
+        op.spans.append(Span(name, depth, start - op._start, seconds, growth))
+
+
+def timed(name):
+    """装饰器：把函数的每次调用作为一次操作计时"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with operation(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def add_listener(listener):
+    """注册操作结束时的回调 listener(operation)，在调用 finish 的线程中执行"""
+    _listeners.append(listener)
+
+
+def last_operation():
+    return _last
+
+
+def _log(op):
+    global _logger
+    path = os.environ.get(LOG_ENV_VAR)
+    if not path:
+        return
+    with _logger_lock:
+        if _logger is None:
+            _logger = logging.getLogger("json_tool.timing")
+            _logger.setLevel(logging.INFO)
+            _logger.propagate = False
+            handler = logging.FileHandler(path, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            _logger.addHandler(handler)
+    _logger.info(json.dumps(op.to_dict(), ensure_ascii=False))
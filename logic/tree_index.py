@@ -0,0 +1,90 @@
+import bisect
+
+
+class SearchIndex:
+    """键和标量值的倒排索引，用于在树形视图中快速定位节点
+
+    每个词（小写的键名或标量值文本）对应命中节点的 (文档顺序, 路径) 列表。
+    查询时在拼接好的词表字符串上用 str.find 做子串匹配，耗时只与去重后的
+    词表大小有关，不需要再遍历整棵数据树。
+    """
+
+    def __init__(self, data):
+        self._terms = {}
+        self._build(data)
+        self._term_list = list(self._terms)
+        # 词表以换行拼接（词内的换行替换为空格，长度不变），记录每个词的起始偏移用于反查
+        self._vocabulary = "\n".join(term.replace("\n", " ") for term in self._term_list)
+        self._offsets = []
+        offset = 0
+        for term in self._term_list:
+            self._offsets.append(offset)
+            offset += len(term) + 1
+
+    def _add(self, term, order, path):
+        hits = self._terms.get(term)
+        if hits is None:
+            self._terms[term] = [(order, path)]
+        else:
+            hits.append((order, path))
+
+    def _build(self, data):
+        # 用显式栈做先序遍历，避免深层嵌套触发递归上限
+        order = 0
+        stack = [((), data, False)]
+        while stack:
+            path, value, is_key = stack.pop()
+            order += 1
+            if is_key:
+                self._add(str(path[-1]).lower(), order, path)
+            if isinstance(value, dict):
+                children = [(path + (k,), v, True) for k, v in value.items()]
+            elif isinstance(value, list):
+                children = [(path + (i,), v, False) for i, v in enumerate(value)]
+            else:
+                self._add(_scalar_term(value), order, path)
+                continue
+            children.reverse()
+            stack.extend(children)
+
+    def _matching_terms(self, query):
+        if "\n" in query:
+            return []
+        terms = []
+        last = -1
+        position = self._vocabulary.find(query)
+        while position >= 0:
+            index = bisect.bisect_right(self._offsets, position) - 1
+            if index != last:
+                terms.append(self._term_list[index])
+                last = index
+            # 跳到下一个词的开头，同一个词只计一次
+            next_start = self._offsets[index + 1] if index + 1 < len(self._offsets) else len(self._vocabulary)
+            position = self._vocabulary.find(query, next_start)
+        return terms
+
+    def find(self, query):
+        """返回键名或值包含查询串（不区分大小写）的路径，按文档顺序排列且去重"""
+        query = query.strip().lower()
+        if not query:
+            return []
+        terms = self._matching_terms(query)
+        hits = []
+        for term in terms:
+            hits.extend(self._terms[term])
+        hits.sort(key=lambda hit: hit[0])
+        paths = []
+        seen = set()
+        for _, path in hits:
+            if path not in seen:
+                seen.add(path)
+                paths.append(path)
+        return paths
+
+
+def _scalar_term(value):
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value).lower()
@@ -1,9 +1,36 @@
 import tkinter as tk
 from tkinter import ttk
+from itertools import islice
 import json
+import re
+from logic.tree_index import SearchIndex
+from logic.timing import span
+
+# 尚未展开的容器节点下的占位子节点文本
+PLACEHOLDER_TEXT = "加载中…"
+# 容器子节点超过该数量时分页显示，每页最多这么多项
+PAGE_SIZE = 1000
+
+# 可以用 .key 形式表示的对象键，其余键使用 ['key'] 形式
+_IDENTIFIER = re.compile(r"^[A-Za-z_$][\w$]*$")
+
+
+def format_json_path(path):
+    """把路径元组格式化为 JSONPath 字符串，例如 ("a", 0, "b.c") -> $.a[0]['b.c']"""
+    parts = ["$"]
+    for key in path:
+        if isinstance(key, int):
+            parts.append(f"[{key}]")
+        elif _IDENTIFIER.match(key):
+            parts.append(f".{key}")
+        else:
+            escaped = key.replace("\\", "\\\\").replace("'", "\\'")
+            parts.append(f"['{escaped}']")
+    return "".join(parts)
+
 
 class JSONTreeView(ttk.Treeview):
-    def __init__(self, master):
+    def __init__(self, master, free_on_collapse=False, page_size=PAGE_SIZE):
         super().__init__(master, columns=("value", "type"), show="tree headings")
         self.heading("value", text="值")
         self.heading("type", text="类型")
@@ -13,6 +40,8 @@ class JSONTreeView(ttk.Treeview):
         # 绑定事件
         self.bind("<Double-1>", self.on_double_click)
         self.bind("<Button-3>", self.on_right_click)
+        self.bind("<<TreeviewOpen>>", self.on_open)
+        self.bind("<<TreeviewClose>>", self.on_close)
         
         # 右键菜单
         self.context_menu = tk.Menu(self, tearoff=0)
@@ -21,6 +50,21 @@ class JSONTreeView(ttk.Treeview):
         
         # 保存数据引用
         self.data = None
+        # 子节点尚未插入的节点：节点 ID -> (容器数据, 起始下标, 结束下标)
+        self._pending = {}
+        self.page_size = page_size
+        # 折叠时是否删除子树以释放内存（再次展开时重新生成）
+        self.free_on_collapse = free_on_collapse
+        # 已经展开过的节点：节点 ID -> (容器数据, 起始下标, 结束下标)，仅在 free_on_collapse 时使用
+        self._expanded = {}
+        # 节点 ID -> 该节点在 self.data 中的路径元组，分页节点对应其所属容器的路径
+        self._paths = {}
+        # 分页节点 ID -> 覆盖的子项下标区间 (起始, 结束)
+        self._spans = {}
+        # 搜索索引在第一次搜索时构建，每次 load 后重建一次
+        self._index = None
+        self._search_hits = []
+        self._search_cursor = -1
         
         # 设置标签样式
         self.tag_configure("dict", foreground="blue")
@@ -29,52 +73,130 @@ class JSONTreeView(ttk.Treeview):
         self.tag_configure("number", foreground="purple")
         self.tag_configure("boolean", foreground="orange")
         self.tag_configure("null", foreground="gray")
+        self.tag_configure("page", foreground="gray")
 
     def load(self, data):
         """加载 JSON 数据到树形视图"""
         try:
-            # 清除现有数据
-            self.delete(*self.get_children())
-            self.data = data
-            # 添加新数据
-            self._insert_node("", data)
+            with span("树形视图"):
+                self._load(data)
         except Exception as e:
             print(f"Error loading data into tree view: {e}")
 
-    def _insert_node(self, parent, data, key=None):
-        """递归插入节点"""
+    def _load(self, data):
+        # 清除现有数据
+        self.delete(*self.get_children())
+        self._pending.clear()
+        self._expanded.clear()
+        self._paths.clear()
+        self._reset_search()
+        self.data = data
+        # 只插入根节点，子节点在展开时才生成
+        self._insert_node("", data, path=())
+
+    def _insert_node(self, parent, data, key=None, path=()):
+        """插入单个节点，容器节点只挂一个占位子节点，展开时再插入真实子节点"""
         try:
             if isinstance(data, dict):
                 node = self.insert(parent, "end", text=str(key) if key is not None else "Object",
                                 values=("", "object"), tags=("dict",))
-                for k, v in data.items():
-                    self._insert_node(node, v, k)
-                return node
             elif isinstance(data, list):
                 node = self.insert(parent, "end", text=str(key) if key is not None else "Array",
                                 values=(f"[{len(data)} items]", "array"), tags=("list",))
-                for i, item in enumerate(data):
-                    self._insert_node(node, item, i)
-                return node
             else:
                 # 处理基本类型
                 value = str(data) if data is not None else "null"
                 type_name = type(data).__name__ if data is not None else "null"
                 tags = (type_name,)
-                return self.insert(parent, "end", text=str(key) if key is not None else "",
+                node = self.insert(parent, "end", text=str(key) if key is not None else "",
                                 values=(value, type_name), tags=tags)
+                self._paths[node] = path
+                return node
+            self._paths[node] = path
+            if data:
+                self._add_placeholder(node, (data, 0, len(data)))
+            return node
         except Exception as e:
             print(f"Error inserting node: {e}")
             return None
 
+    def _add_placeholder(self, node, pending):
+        # 占位子节点让展开箭头保持可见
+        self.insert(node, "end", text=PLACEHOLDER_TEXT)
+        self._pending[node] = pending
+
+    def _populate(self, node):
+        """把待展开节点的占位子节点替换为真实子节点或分页节点"""
+        pending = self._pending.pop(node, None)
+        if pending is None:
+            return
+        self.delete(*self.get_children(node))
+        data, start, stop = pending
+        path = self._paths[node]
+        if stop - start > self.page_size:
+            self._insert_pages(node, data, start, stop)
+        else:
+            if isinstance(data, dict):
+                items = islice(data.items(), start, stop)
+            else:
+                items = zip(range(start, stop), data[start:stop])
+            for k, v in items:
+                self._insert_node(node, v, k, path + (k,))
+        if self.free_on_collapse:
+            self._expanded[node] = pending
+
+    def _insert_pages(self, node, data, start, stop):
+        """把 [start, stop) 拆成不超过 page_size 个分页节点
+
+        每页的大小取 page_size 的整数次幂，使任意一层的子节点数都不超过
+        page_size，再大的容器也只会按用户实际展开的路径生成节点。
+        """
+        page = self.page_size
+        while (stop - start) > page * self.page_size:
+            page *= self.page_size
+        for page_start in range(start, stop, page):
+            page_stop = min(page_start + page, stop)
+            page_node = self.insert(node, "end", text=f"[{page_start}..{page_stop - 1}]",
+                                    values=(f"[{page_stop - page_start} items]", "page"),
+                                    tags=("page",))
+            self._paths[page_node] = self._paths[node]
+            self._spans[page_node] = (page_start, page_stop)
+            self._add_placeholder(page_node, (data, page_start, page_stop))
+
+    def on_open(self, event):
+        """展开节点时才插入其子节点"""
+        try:
+            self._populate(self.focus())
+        except Exception as e:
+            print(f"Error expanding node: {e}")
+
+    def on_close(self, event):
+        """折叠节点时按需释放子树"""
+        try:
+            node = self.focus()
+            if not self.free_on_collapse or node not in self._expanded:
+                return
+            pending = self._expanded.pop(node)
+            self._forget_subtree(node)
+            self.delete(*self.get_children(node))
+            self._add_placeholder(node, pending)
+        except Exception as e:
+            print(f"Error collapsing node: {e}")
+
+    def _forget_subtree(self, node):
+        # 清理子树中节点的登记信息，只遍历已经实际展开过的部分
+        for child in self.get_children(node):
+            self._paths.pop(child, None)
+            self._spans.pop(child, None)
+            self._pending.pop(child, None)
+            if child in self._expanded:
+                del self._expanded[child]
+                self._forget_subtree(child)
+
     def on_double_click(self, event):
         """双击节点时复制值"""
         try:
-            item = self.selection()[0]
-            values = self.item(item)["values"]
-            if values and values[0]:
-                self.clipboard_clear()
-                self.clipboard_append(values[0])
+            self._copy_value()
         except Exception as e:
             print(f"Error on double click: {e}")
 
@@ -89,13 +211,16 @@ class JSONTreeView(ttk.Treeview):
             print(f"Error on right click: {e}")
 
     def _copy_value(self):
-        """复制选中节点的值"""
+        """复制选中节点的完整值，容器节点复制整个子树的 JSON"""
         try:
             item = self.selection()[0]
-            values = self.item(item)["values"]
-            if values and values[0]:
-                self.clipboard_clear()
-                self.clipboard_append(values[0])
+            value = self.get_value(item)
+            if isinstance(value, str):
+                text = value
+            else:
+                text = json.dumps(value, indent=2, ensure_ascii=False)
+            self.clipboard_clear()
+            self.clipboard_append(text)
         except Exception as e:
             print(f"Error copying value: {e}")
 
@@ -110,30 +235,112 @@ class JSONTreeView(ttk.Treeview):
         except Exception as e:
             print(f"Error copying path: {e}")
 
+    def get_path(self, item):
+        """返回节点在 self.data 中的路径元组，无需访问 Tk"""
+        return self._paths[item]
+
+    def get_value(self, item):
+        """按路径直接从 self.data 中取出节点的完整值"""
+        value = self.data
+        for key in self._paths[item]:
+            value = value[key]
+        return value
+
     def get_json_path(self, item):
         """获取节点的 JSON 路径"""
         try:
-            path = []
-            while item:
-                parent = self.parent(item)
-                if not parent:
-                    break
-                text = self.item(item)["text"]
-                if str(text).isdigit():
-                    path.append(f"[{text}]")
-                else:
-                    path.append(f".{text}" if text else "")
-                item = parent
-            path.reverse()
-            return "$" + "".join(path)
+            return format_json_path(self._paths[item])
         except Exception as e:
             print(f"Error getting JSON path: {e}")
             return ""
 
+    def _reset_search(self):
+        self._spans.clear()
+        self._index = None
+        self._search_hits = []
+        self._search_cursor = -1
+
+    def search(self, query):
+        """在键名和标量值中搜索（不区分大小写的子串匹配）
+
+        Returns:
+            int: 命中的节点数，随后用 search_next / search_previous 逐个定位
+        """
+        if self.data is None:
+            return 0
+        if self._index is None:
+            with span("建立树索引"):
+                self._index = SearchIndex(self.data)
+        with span("树搜索"):
+            self._search_hits = self._index.find(query)
+        self._search_cursor = -1
+        return len(self._search_hits)
+
+    def search_next(self):
+        """定位到下一个命中，返回 (当前序号, 总数)，没有命中时返回 None"""
+        return self._move_search_cursor(1)
+
+    def search_previous(self):
+        """定位到上一个命中，返回 (当前序号, 总数)，没有命中时返回 None"""
+        return self._move_search_cursor(-1)
+
+    def _move_search_cursor(self, step):
+        if not self._search_hits:
+            return None
+        self._search_cursor = (self._search_cursor + step) % len(self._search_hits)
+        self.reveal(self._search_hits[self._search_cursor])
+        return self._search_cursor + 1, len(self._search_hits)
+
+    def reveal(self, path):
+        """逐层展开到指定路径并选中该节点，只生成路径上需要的节点
+
+        Returns:
+            目标节点 ID，路径不存在时返回 None
+        """
+        roots = self.get_children("")
+        if not roots:
+            return None
+        node = roots[0]
+        value = self.data
+        depth = 0
+        while depth < len(path):
+            key = path[depth]
+            self._populate(node)
+            self.item(node, open=True)
+            child_path = path[:depth + 1]
+            # 分页节点按子项下标定位，对象的下标只在遇到分页时才计算
+            position = key if isinstance(value, list) else None
+            target = None
+            for child in self.get_children(node):
+                page = self._spans.get(child)
+                if page is not None:
+                    if position is None:
+                        position = list(value).index(key)
+                    if page[0] <= position < page[1]:
+                        target = child
+                        break
+                elif self._paths.get(child) == child_path:
+                    target = child
+                    break
+            if target is None:
+                return None
+            node = target
+            if page is None:
+                value = value[key]
+                depth += 1
+        self.see(node)
+        self.selection_set(node)
+        self.focus(node)
+        return node
+
     def clear(self):
         """清除树形视图的所有数据"""
         try:
             self.delete(*self.get_children())
+            self._pending.clear()
+            self._expanded.clear()
+            self._paths.clear()
+            self._reset_search()
             self.data = None
         except Exception as e:
             print(f"Error clearing tree view: {e}")
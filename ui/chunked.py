@@ -0,0 +1,74 @@
+import tkinter as tk
+
+# 超过该长度的文本分块插入
+CHUNKED_THRESHOLD = 1024 * 1024
+# 每个 after 周期插入的字符数
+CHUNK_CHARS = 256 * 1024
+
+
+class ChunkedInserter:
+    """把大段文本分多次插入 Text 控件，每插入一块就把控制权交还给事件循环
+
+    一次性 insert 几百 MB 的文本会让 Tk 长时间无响应；分块后界面可以
+    显示进度，也可以随时取消。同一时间只有一个插入任务，开始新任务会取消旧任务。
+    """
+
+    def __init__(self, text_widget, chunk_chars=CHUNK_CHARS, on_progress=None):
+        """
+        Args:
+            text_widget: 目标 Text 控件
+            chunk_chars: 每块字符数
+            on_progress: 进度回调 on_progress(已插入字符数, 总字符数)
+        """
+        self.text_widget = text_widget
+        self.chunk_chars = chunk_chars
+        self.on_progress = on_progress
+        self._job = None
+        self._text = None
+        self._position = 0
+        self._on_done = None
+
+    @property
+    def running(self):
+        return self._job is not None
+
+    def start(self, text, on_done=None):
+        """清空控件并开始分块插入 text
+
+        Args:
+            text: 要插入的文本
+            on_done: 结束回调 on_done(completed)，completed 为 False 表示被取消
+        """
+        self.cancel()
+        self.text_widget.delete("1.0", tk.END)
+        self._text = text
+        self._position = 0
+        self._on_done = on_done
+        self._job = self.text_widget.after_idle(self._step)
+
+    def _step(self):
+        text = self._text
+        end = min(self._position + self.chunk_chars, len(text))
+        self.text_widget.insert(tk.END, text[self._position:end])
+        self._position = end
+        if self.on_progress is not None:
+            self.on_progress(end, len(text))
+        if end < len(text):
+            # after(1) 而不是 after_idle：保证两块之间能处理输入和重绘事件
+            self._job = self.text_widget.after(1, self._step)
+        else:
+            self._finish(True)
+
+    def cancel(self):
+        """取消正在进行的插入，已插入的部分保留在控件中"""
+        if self._job is not None:
+            self.text_widget.after_cancel(self._job)
+            self._finish(False)
+
+    def _finish(self, completed):
+        on_done = self._on_done
+        self._job = None
+        self._text = None
+        self._on_done = None
+        if on_done is not None:
+            on_done(completed)
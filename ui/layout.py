@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext, ttk
 from logic.converter import Converter
+from logic.formatter import Formatter
 from logic.comm import (
     toggle_dark_mode,
     auto_parse,
@@ -9,19 +10,44 @@ from logic.comm import (
     search_text,
     replace_text,
     replace_all_text,
+    REPLACE_SCOPES,
+    navigate_next,
+    navigate_previous,
     run_jsonpath
 )
+from logic.lexer import tokenize_head
+from logic.mapped import LARGE_FILE_THRESHOLD, MappedFile
+from logic.parse import parse_cache
+from logic.parser_pool import ParserPool
+from logic.session import DocumentSession
+from logic.timing import Operation, add_listener, operation, span, timed
+from ui.chunked import CHUNKED_THRESHOLD, ChunkedInserter
+from ui.pager import PagedViewer
+from ui.worker import BackgroundWorker
 import json
-import random
-import datetime
-import uuid
+import os
 
 converter = Converter()
+formatter = Formatter()
 
-# 这些第三方库延迟导入
-yaml = None
-xmltodict = None
-jsonpath_ng = None
+# 显示识别出的输入格式及置信度，附带解析缓存的命中情况
+def format_label(fmt, confidence):
+    info = parse_cache.cache_info()
+    return f"识别为 {fmt.upper()}（置信度 {confidence:.0%}）  缓存 命中 {info.hits} / 未命中 {info.misses}"
+
+
+# 预览时在后台预先计算高亮的行数，覆盖首屏及滚动边距
+PREVIEW_HIGHLIGHT_LINES = 200
+
+
+# 在后台线程中执行：解析输入并生成格式化文本
+def parse_for_preview(parser_pool, raw):
+    data, fmt, confidence = parser_pool.parse_with_format(raw)
+    with span("序列化"):
+        formatted = json.dumps(data, indent=2, ensure_ascii=False)
+    with span("预计算高亮"):
+        highlight = tokenize_head(formatted, PREVIEW_HIGHLIGHT_LINES)
+    return data, formatted, highlight, fmt, confidence
 
 
 # GUI 主构建函数
@@ -30,6 +56,11 @@ def build_gui(root):
     root.geometry("1200x800")  # 增加窗口大小以适应树形视图
     root.minsize(1200, 800)
 
+    # 状态栏：显示上一个操作各阶段的耗时和峰值内存增长
+    status_bar = tk.Label(root, text="", anchor="w", relief=tk.SUNKEN, bd=1)
+    status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+    add_listener(lambda op: status_bar.config(text=op.summary()))
+
     # 创建左右分栏
     left_frame = ttk.Frame(root)
     left_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -57,8 +88,11 @@ def build_gui(root):
                              "Excel 转 JSON",
                              "格式化输出",
                              "压缩输出",
+                             "格式化文件",
+                             "压缩文件",
                              "复制结果",
                              "保存结果",
+                             "导出 Excel",
                              "生成模板"
                          ])
     combo.pack(side=tk.LEFT, padx=5)
@@ -69,10 +103,54 @@ def build_gui(root):
     output_text = scrolledtext.ScrolledText(left_frame, wrap=tk.WORD, height=15, font=get_monospace_font(11))
     output_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
 
+    # 大段输出分块插入时显示的进度条，插入结束后隐藏
+    render_progress_frame = ttk.Frame(left_frame)
+    render_progress = ttk.Progressbar(render_progress_frame, mode="determinate", maximum=100)
+    render_progress.pack(side=tk.LEFT, fill=tk.X, expand=True)
+    render_progress_label = tk.Label(render_progress_frame, text="")
+    render_progress_label.pack(side=tk.LEFT, padx=5)
+    ttk.Button(render_progress_frame, text="取消",
+               command=lambda: output_inserter.cancel()).pack(side=tk.LEFT)
+
+    def update_render_progress(done, total):
+        render_progress["value"] = done * 100 / total
+        render_progress_label.config(text=f"正在渲染 {done / (1024 * 1024):.0f} / {total / (1024 * 1024):.0f} MB")
+
+    output_inserter = ChunkedInserter(output_text, on_progress=update_render_progress)
+
     # JSON 树形视图（右侧）
     tk.Label(right_frame, text="JSON 树形视图").pack(anchor='w', padx=10, pady=(10, 0))
     from logic.treeview import JSONTreeView
     tree_view = JSONTreeView(right_frame)
+
+    # 树形视图搜索栏：基于键和值的索引，可搜索折叠节点中的内容
+    tree_search_frame = tk.Frame(right_frame)
+    tree_search_frame.pack(fill=tk.X, padx=10, pady=(0, 5))
+    tree_search_entry = tk.Entry(tree_search_frame, width=30)
+    tree_search_entry.pack(side=tk.LEFT)
+    tree_search_label = tk.Label(tree_search_frame, text="")
+
+    @timed("树形搜索")
+    def tree_search():
+        count = tree_view.search(tree_search_entry.get())
+        if not count:
+            tree_search_label.config(text="未找到")
+            return
+        tree_search_move(tree_view.search_next)
+
+    def tree_search_move(move):
+        position = move()
+        if position:
+            tree_search_label.config(text=f"{position[0]}/{position[1]}")
+
+    tk.Button(tree_search_frame, text="搜索", command=tree_search).pack(side=tk.LEFT, padx=2)
+    tk.Button(tree_search_frame, text="上一个",
+              command=lambda: tree_search_move(tree_view.search_previous)).pack(side=tk.LEFT, padx=2)
+    tk.Button(tree_search_frame, text="下一个",
+              command=lambda: tree_search_move(tree_view.search_next)).pack(side=tk.LEFT, padx=2)
+    tree_search_label.pack(side=tk.LEFT, padx=5)
+    tree_search_entry.bind("<Return>", lambda e: tree_search())
+
     tree_view.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
 
     # 查找/替换/JSONPath/导航/暗黑模式控件
@@ -87,22 +165,60 @@ def build_gui(root):
     replace_entry = tk.Entry(control_frame, width=15)
     replace_entry.grid(row=0, column=3)
 
-    find_btn = tk.Button(control_frame, text="查找", command=lambda: search_text(output_text, find_entry, nav_label))
+    regex_var = tk.BooleanVar(value=False)
+    case_var = tk.BooleanVar(value=False)
+    find_btn = tk.Button(control_frame, text="查找",
+                         command=lambda: search_text(output_text, find_entry, nav_label,
+                                                     regex_var.get(), case_var.get()))
     find_btn.grid(row=0, column=4, padx=2)
     replace_btn = tk.Button(control_frame, text="替换", command=lambda: replace_text(output_text, find_entry, replace_entry))
     replace_btn.grid(row=0, column=5, padx=2)
-    replace_all_btn = tk.Button(control_frame, text="全部替换", command=lambda: replace_all_text(output_text, find_entry, replace_entry))
+    replace_scope_var = tk.StringVar(value="仅值")
+    replace_in_path_var = tk.BooleanVar(value=False)
+
+    @timed("全部替换")
+    def replace_all():
+        jsonpath = jsonpath_entry.get().strip() if replace_in_path_var.get() else None
+        output_inserter.cancel()
+        try:
+            replace_all_text(output_text, find_entry, replace_entry, nav_label,
+                             REPLACE_SCOPES[replace_scope_var.get()], jsonpath,
+                             regex_var.get(), case_var.get(), session)
+        except Exception as e:
+            messagebox.showerror("替换失败", str(e))
+
+    replace_all_btn = tk.Button(control_frame, text="全部替换", command=replace_all)
     replace_all_btn.grid(row=0, column=6, padx=2)
+    ttk.Combobox(control_frame, textvariable=replace_scope_var, state="readonly", width=8,
+                 values=list(REPLACE_SCOPES)).grid(row=0, column=7, padx=2)
 
     tk.Label(control_frame, text="JSONPath").grid(row=1, column=0, sticky="w", pady=(5, 0))
     jsonpath_entry = tk.Entry(control_frame, width=40)
     jsonpath_entry.grid(row=1, column=1, columnspan=3, pady=(5, 0))
-    jsonpath_btn = tk.Button(control_frame, text="提取", command=lambda: run_jsonpath(output_text, jsonpath_entry))
+    @timed("JSONPath 提取")
+    def extract_jsonpath():
+        output_inserter.cancel()
+        run_jsonpath(output_text, jsonpath_entry, session, tree_view)
+
+    jsonpath_btn = tk.Button(control_frame, text="提取", command=extract_jsonpath)
     jsonpath_btn.grid(row=1, column=4, padx=2, pady=(5, 0))
 
     nav_label = tk.Label(control_frame, text="")
     nav_label.grid(row=1, column=5, columnspan=2, sticky="w", padx=5)
 
+    tk.Checkbutton(control_frame, text="正则", variable=regex_var).grid(row=2, column=0, sticky="w")
+    tk.Checkbutton(control_frame, text="区分大小写", variable=case_var).grid(row=2, column=1, sticky="w")
+    prev_btn = tk.Button(control_frame, text="上一个",
+                         command=lambda: navigate_previous(output_text, find_entry, nav_label,
+                                                           regex_var.get(), case_var.get()))
+    prev_btn.grid(row=2, column=4, padx=2, pady=(5, 0))
+    next_btn = tk.Button(control_frame, text="下一个",
+                         command=lambda: navigate_next(output_text, find_entry, nav_label,
+                                                       regex_var.get(), case_var.get()))
+    next_btn.grid(row=2, column=5, padx=2, pady=(5, 0))
+    tk.Checkbutton(control_frame, text="仅替换 JSONPath 范围内",
+                   variable=replace_in_path_var).grid(row=2, column=6, columnspan=2, sticky="w")
+
     dark_mode_var = tk.BooleanVar(value=False)
     def toggle_dark():
         toggle_dark_mode(dark_mode_var.get(), root, [input_text, output_text, find_entry, replace_entry, jsonpath_entry])
@@ -111,9 +227,15 @@ def build_gui(root):
     dark_btn.grid(row=1, column=7, padx=5, pady=(5, 0))
     
     def clear_all():
+        nonlocal large_file_note
+        large_file_note = None
+        output_inserter.cancel()
+        session.clear()
         input_text.delete("1.0", tk.END)
         output_text.delete("1.0", tk.END)
-        tree_view.delete(*tree_view.get_children())
+        tree_view.clear()
+        tree_search_entry.delete(0, tk.END)
+        tree_search_label.config(text="")
         find_entry.delete(0, tk.END)
         replace_entry.delete(0, tk.END)
         jsonpath_entry.delete(0, tk.END)
@@ -126,36 +248,124 @@ def build_gui(root):
     # 防抖计时器变量
     debounce_id = None
 
+    # 当前文档的解析结果，所有面板和操作共享，只有输入变化时才重新解析
+    session = DocumentSession()
+    # 大文件模式下输入区显示的说明文字；文件内容只在分页查看器中浏览
+    large_file_note = None
+
+    # 慢速解析器和大输入在预热的子进程中解析，超时或超内存会被强制结束
+    parser_pool = ParserPool()
+    root.bind("<Destroy>", lambda e: e.widget is root and parser_pool.shutdown())
+
+    # 解析与序列化放到后台线程，避免大输入时界面卡顿
+    preview_worker = BackgroundWorker(root)
+    # 文件级的流式格式化/压缩单独使用一个工作线程，不受输入预览的影响
+    file_worker = BackgroundWorker(root)
+
     # 自动解析输入并更新输出，带防抖
     def try_parse_and_update():
         nonlocal debounce_id
+        nonlocal large_file_note
         debounce_id = None
         raw = input_text.get("1.0", tk.END).strip()
+        if large_file_note is not None:
+            if raw == large_file_note:
+                return
+            # 说明文字被编辑，退出大文件模式
+            large_file_note = None
         if not raw:
+            preview_worker.invalidate()
+            output_inserter.cancel()
             output_text.delete("1.0", tk.END)
             nav_label.config(text="")
             return
-        try:
-            data = auto_parse(raw)
-            formatted = json.dumps(data, indent=2, ensure_ascii=False)
+        op = Operation("实时预览")
+        with op.active():
+            preview_worker.submit(parse_for_preview,
+                                  lambda result, error: show_preview(op, raw, result, error),
+                                  parser_pool, raw)
+
+    def show_preview(op, raw, result, error):
+        with op.active():
+            _show_preview(raw, result, error)
+        op.finish()
+
+    def _show_preview(raw, result, error):
+        output_inserter.cancel()
+        if error is not None:
             output_text.delete("1.0", tk.END)
-            output_text.insert(tk.END, formatted)
-            highlight_json(output_text)
-            nav_label.config(text="")
-        except Exception as e:
-            output_text.delete("1.0", tk.END)
-            output_text.insert(tk.END, f"解析失败: {e}")
+            output_text.insert(tk.END, f"解析失败: {error}")
             nav_label.config(text="")
+            return
+        data, formatted, highlight, fmt, confidence = result
+        session.load(raw, data, fmt, confidence, rendered=formatted)
+        render_output(formatted, highlight)
+        nav_label.config(text=format_label(fmt, confidence))
 
     def on_input_change(event):
         nonlocal debounce_id
         input_text.edit_modified(False)
+        # 输入一变化，正在进行的解析结果就已经过期
+        preview_worker.invalidate()
         if debounce_id:
             root.after_cancel(debounce_id)
         debounce_id = root.after(600, try_parse_and_update)
 
     input_text.bind('<<Modified>>', on_input_change)
 
+    # 取得输入区的解析结果，只有输入文本变化后才重新解析
+    def current_data():
+        raw = input_text.get("1.0", tk.END).strip()
+        if large_file_note is not None and raw == large_file_note and not session.is_current(raw):
+            raise ValueError("大文件仍在解析中，请稍候")
+        if not session.is_current(raw):
+            data, fmt, confidence = parser_pool.parse_with_format(raw)
+            session.load(raw, data, fmt, confidence)
+        return session.data
+
+    # 取得输出区对应的数据：输出区仍是会话数据的渲染结果时直接复用，否则解析输出文本
+    def current_output():
+        raw = output_text.get("1.0", tk.END).strip()
+        if not session.is_rendered(raw):
+            session.set_output(auto_parse(raw))
+        return session.output
+
+    # 把会话输出数据的渲染文本放进输出区；文本很大时分块插入，期间界面保持响应，可以取消
+    def render_output(text, precomputed_highlight=None):
+        output_inserter.cancel()
+        if len(text) <= CHUNKED_THRESHOLD:
+            with span("插入文本"):
+                output_text.delete("1.0", tk.END)
+                output_text.insert(tk.END, text)
+            highlight_json(output_text, precomputed=precomputed_highlight)
+            return
+
+        version = session.version
+        # 分块插入在当前操作结束后仍在进行，单独作为一个操作计时
+        render_op = Operation("分块渲染")
+
+        def done(completed):
+            render_op.finish()
+            render_progress_frame.pack_forget()
+            if not completed:
+                output_text.insert(tk.END, "\n…（已取消渲染，此处内容不完整；复制、保存和其他操作仍使用完整结果）")
+                if session.version == version:
+                    session.set_placeholder(output_text.get("1.0", "end-1c"))
+            highlight_json(output_text)
+
+        render_progress["value"] = 0
+        render_progress_frame.pack(fill=tk.X, padx=10, pady=(0, 5), before=output_text)
+        output_inserter.start(text, done)
+
+    # 把数据作为新的输出显示在输出区，indent 为 None 时显示压缩格式
+    def show_output(data, indent=2, load_tree=True):
+        output_inserter.cancel()
+        session.set_output(data)
+        session.display_indent = indent
+        render_output(session.render(indent))
+        if load_tree:
+            tree_view.load(data)
+
     # 操作按钮实现
     def open_file():
         path = filedialog.askopenfilename(filetypes=[
@@ -163,6 +373,9 @@ def build_gui(root):
             ("所有文件", "*.*")])
         if path:
             try:
+                if os.path.getsize(path) > LARGE_FILE_THRESHOLD:
+                    open_large_file(path)
+                    return
                 with open(path, 'r', encoding='utf-8') as f:
                     content = f.read()
                 input_text.delete("1.0", tk.END)
@@ -170,39 +383,107 @@ def build_gui(root):
             except Exception as e:
                 messagebox.showerror("打开失败", str(e))
 
+    # 大文件以内存映射方式打开：内容在只读分页窗口中浏览，解析直接读取映射区，
+    # 不经过输入框，解析结果只保存在会话中，不展开到输出区
+    def open_large_file(path):
+        nonlocal large_file_note
+        mapped = MappedFile(path)
+        note = (f"[大文件模式] {path}\n"
+                f"{mapped.size / (1024 * 1024):.1f} MB，内容在分页查看器中浏览，没有载入输入框。\n"
+                f"编辑此处将退出大文件模式。")
+        large_file_note = note
+        output_inserter.cancel()
+        session.clear()
+        preview_worker.invalidate()
+        input_text.delete("1.0", tk.END)
+        input_text.insert(tk.END, note)
+        output_text.delete("1.0", tk.END)
+        tree_view.clear()
+        PagedViewer(root, mapped)
+        nav_label.config(text="正在解析大文件…")
+        op = Operation("打开大文件")
+        with op.active():
+            file_worker.submit(mapped.parse, lambda result, error: show_large_file(op, note, result, error),
+                               parser_pool.parse_with_format)
+
+    def show_large_file(op, note, result, error):
+        with op.active():
+            _show_large_file(note, result, error)
+        op.finish()
+
+    def _show_large_file(note, result, error):
+        if large_file_note != note:
+            return
+        output_inserter.cancel()
+        output_text.delete("1.0", tk.END)
+        if error is not None:
+            output_text.insert(tk.END, f"解析失败: {error}")
+            nav_label.config(text="")
+            return
+        data, fmt, confidence = result
+        placeholder = (f"[大文件模式] 已解析为 {fmt.upper()}，结果没有在这里展开。\n"
+                       f"可以直接使用 JSONPath 提取、数据转换、导出 Excel 等操作；"
+                       f"选择“格式化输出”会把完整结果渲染到这里。")
+        session.load(note, data, fmt, confidence, placeholder=placeholder)
+        output_text.insert(tk.END, placeholder)
+        tree_view.load(data)
+        nav_label.config(text=format_label(fmt, confidence))
+
+    @timed("格式化输出")
     def format_output():
         raw = output_text.get("1.0", tk.END).strip()
         if not raw:
             messagebox.showwarning("提示", "输出为空，无法格式化")
             return
         try:
-            data = auto_parse(raw)
-            formatted = json.dumps(data, indent=2, ensure_ascii=False)
-            output_text.delete("1.0", tk.END)
-            output_text.insert(tk.END, formatted)
-            highlight_json(output_text)
+            show_output(current_output(), load_tree=False)
         except Exception as e:
             messagebox.showerror("格式化失败", str(e))
 
+    @timed("压缩输出")
     def minify_output():
         raw = output_text.get("1.0", tk.END).strip()
         if not raw:
             messagebox.showwarning("提示", "输出为空，无法压缩")
             return
         try:
-            data = auto_parse(raw)
-            minified = json.dumps(data, separators=(',', ':'), ensure_ascii=False)
-            output_text.delete("1.0", tk.END)
-            output_text.insert(tk.END, minified)
-            highlight_json(output_text)
+            show_output(current_output(), indent=None, load_tree=False)
         except Exception as e:
             messagebox.showerror("压缩失败", str(e))
 
+    # 流式处理文件，不把内容载入编辑框，适合超大文件
+    def reformat_file(indent):
+        title = "格式化文件" if indent is not None else "压缩文件"
+        source = filedialog.askopenfilename(title=f"{title}：选择输入文件", filetypes=[
+            ("JSON 文件", "*.json *.ndjson *.jsonl"), ("所有文件", "*.*")])
+        if not source:
+            return
+        target = filedialog.asksaveasfilename(title=f"{title}：保存到", defaultextension=".json",
+                                              filetypes=[("JSON 文件", "*.json"), ("所有文件", "*.*")])
+        if not target:
+            return
+        if target == source:
+            messagebox.showwarning("提示", "输出文件不能与输入文件相同")
+            return
+
+        def done(result, error):
+            if error is not None:
+                messagebox.showerror(f"{title}失败", str(error))
+            else:
+                nav_label.config(text="")
+                messagebox.showinfo("成功", f"已写入：{target}")
+
+        nav_label.config(text=f"正在{title}…")
+        file_worker.submit(formatter.format_stream, done, source, target, indent)
+
+    # 复制和保存：输出区仍对应会话数据时直接使用会话中的完整结果，不依赖输出区里（可能被截断的）文本
     def copy_output():
         text = output_text.get("1.0", tk.END).strip()
         if not text:
             messagebox.showwarning("提示", "输出为空，无法复制")
             return
+        if session.is_rendered(text):
+            text = session.render(session.display_indent)
         root.clipboard_clear()
         root.clipboard_append(text)
         messagebox.showinfo("复制成功", "内容已复制到剪贴板")
@@ -217,7 +498,10 @@ def build_gui(root):
         if path:
             try:
                 with open(path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                    if session.is_rendered(content):
+                        session.write_output(f, session.display_indent)
+                    else:
+                        f.write(content)
                 messagebox.showinfo("保存成功", f"文件已保存：{path}")
             except Exception as e:
                 messagebox.showerror("保存失败", str(e))
@@ -229,13 +513,9 @@ def build_gui(root):
             messagebox.showwarning("提示", "请先输入 JSON Schema")
             return
         try:
-            schema = json.loads(raw)
+            schema = current_data()
             result = converter.generate_template(schema)
-            output_text.delete("1.0", tk.END)
-            output_text.insert(tk.END, json.dumps(result, indent=2, ensure_ascii=False))
-            highlight_json(output_text)
-            # 更新树形视图
-            tree_view.load(result)
+            show_output(result)
         except json.JSONDecodeError as e:
             messagebox.showerror("JSON Schema 格式错误", str(e))
         except Exception as e:
@@ -244,40 +524,28 @@ def build_gui(root):
     def xml_to_json_action():
         raw = input_text.get("1.0", tk.END).strip()
         try:
-            data = converter.xml_to_json(raw)
-            output_text.delete("1.0", tk.END)
-            output_text.insert(tk.END, json.dumps(data, indent=2, ensure_ascii=False))
-            highlight_json(output_text)
+            show_output(converter.xml_to_json(raw), load_tree=False)
         except Exception as e:
             messagebox.showerror("XML 解析失败", str(e))
 
     def yaml_to_json_action():
         raw = input_text.get("1.0", tk.END).strip()
         try:
-            data = converter.yaml_to_json(raw)
-            output_text.delete("1.0", tk.END)
-            output_text.insert(tk.END, json.dumps(data, indent=2, ensure_ascii=False))
-            highlight_json(output_text)
+            show_output(converter.yaml_to_json(raw), load_tree=False)
         except Exception as e:
             messagebox.showerror("YAML 解析失败", str(e))
 
     def csv_to_json_action():
         raw = input_text.get("1.0", tk.END).strip()
         try:
-            data = converter.csv_to_json(raw)
-            output_text.delete("1.0", tk.END)
-            output_text.insert(tk.END, json.dumps(data, indent=2, ensure_ascii=False))
-            highlight_json(output_text)
+            show_output(converter.csv_to_json(raw), load_tree=False)
         except Exception as e:
             messagebox.showerror("CSV 解析失败", str(e))
 
     def url_to_json_action():
         raw = input_text.get("1.0", tk.END).strip()
         try:
-            data = converter.url_to_json(raw)
-            output_text.delete("1.0", tk.END)
-            output_text.insert(tk.END, json.dumps(data, indent=2, ensure_ascii=False))
-            highlight_json(output_text)
+            show_output(converter.url_to_json(raw), load_tree=False)
         except Exception as e:
             messagebox.showerror("URL 解析失败", str(e))
 
@@ -286,31 +554,21 @@ def build_gui(root):
         if not path:
             return
         try:
-            data = converter.excel_to_json(path)
-            output_text.delete("1.0", tk.END)
-            output_text.insert(tk.END, json.dumps(data, indent=2, ensure_ascii=False))
-            highlight_json(output_text)
+            show_output(converter.excel_to_json(path), load_tree=False)
         except Exception as e:
              messagebox.showerror("Excel 解析失败", str(e))
 
     # 更新解析函数
+    @timed("解析")
     def parse_and_show():
         raw = input_text.get("1.0", tk.END).strip()
         if not raw:
             messagebox.showwarning("提示", "请先输入内容")
             return
         try:
-            # 清除旧的树形视图数据
-            tree_view.delete(*tree_view.get_children())
-            
-            data = auto_parse(raw)
-            formatted = json.dumps(data, indent=2, ensure_ascii=False)
-            output_text.delete("1.0", tk.END)
-            output_text.insert(tk.END, formatted)
-            highlight_json(output_text)
-            
-            # 重新加载树形视图
-            tree_view.load(data)
+            # 输入未变化时直接复用已有的解析结果
+            show_output(current_data())
+            nav_label.config(text=format_label(session.format, session.confidence))
         except Exception as e:
             messagebox.showerror("解析失败", str(e))
 
@@ -321,76 +579,67 @@ def build_gui(root):
             return
             
         raw = input_text.get("1.0", tk.END).strip()
-        if not raw and action != "打开文件":
+        if not raw and action not in ("打开文件", "格式化文件", "压缩文件"):
             messagebox.showwarning("提示", "请先输入内容")
             return
 
-        try:
-            result = None
-            if action == "打开文件":
-                open_file()
-                return
-            elif action == "XML 转 JSON":
-                result = converter.xml_to_json(raw)
-            elif action == "YAML 转 JSON":
-                result = converter.yaml_to_json(raw)
-            elif action == "CSV 转 JSON":
-                result = converter.csv_to_json(raw)
-            elif action == "URL 参数转 JSON":
-                result = converter.url_to_json(raw)
-            elif action == "格式化输出":
-                data = auto_parse(raw)
-                result = data
-            elif action == "压缩输出":
-                data = auto_parse(raw)
-                formatted = json.dumps(data, separators=(',', ':'), ensure_ascii=False)
-                output_text.delete("1.0", tk.END)
-                output_text.insert(tk.END, formatted)
-                return
-            elif action == "复制结果":
-                result_text = output_text.get("1.0", tk.END).strip()
-                if not result_text:
-                    messagebox.showwarning("提示", "输出为空，无法复制")
+        with operation(action):
+            try:
+                result = None
+                if action == "打开文件":
+                    open_file()
                     return
-                root.clipboard_clear()
-                root.clipboard_append(result_text)
-                messagebox.showinfo("成功", "已复制到剪贴板")
-                return
-            elif action == "保存结果":
-                result_text = output_text.get("1.0", tk.END).strip()
-                if not result_text:
-                    messagebox.showwarning("提示", "输出为空，无法保存")
+                elif action == "XML 转 JSON":
+                    result = converter.xml_to_json(raw)
+                elif action == "YAML 转 JSON":
+                    result = converter.yaml_to_json(raw)
+                elif action == "CSV 转 JSON":
+                    result = converter.csv_to_json(raw)
+                elif action == "URL 参数转 JSON":
+                    result = converter.url_to_json(raw)
+                elif action == "格式化输出":
+                    result = current_data()
+                elif action == "压缩输出":
+                    show_output(current_data(), indent=None, load_tree=False)
                     return
-                save_path = filedialog.asksaveasfilename(
-                    defaultextension=".json",
-                    filetypes=[("JSON 文件", "*.json"), ("所有文件", "*.*")]
-                )
-                if save_path:
-                    with open(save_path, 'w', encoding='utf-8') as f:
-                        f.write(result_text)
-                    messagebox.showinfo("成功", f"已保存到：{save_path}")
-                return
-            elif action == "生成模板":
-                try:
-                    schema = json.loads(raw)
-                    result = converter.generate_template(schema)
-                except Exception as e:
-                    messagebox.showerror("模板生成失败", str(e))
+                elif action == "格式化文件":
+                    reformat_file(2)
+                    return
+                elif action == "压缩文件":
+                    reformat_file(None)
+                    return
+                elif action == "复制结果":
+                    copy_output()
+                    return
+                elif action == "保存结果":
+                    save_output()
                     return
+                elif action == "导出 Excel":
+                    if not session.has_output:
+                        current_data()
+                    save_path = filedialog.asksaveasfilename(
+                        defaultextension=".xlsx",
+                        filetypes=[("Excel 文件", "*.xlsx"), ("所有文件", "*.*")]
+                    )
+                    if save_path:
+                        converter.json_to_excel(session.output, save_path)
+                        messagebox.showinfo("成功", f"已导出到：{save_path}")
+                    return
+                elif action == "生成模板":
+                    try:
+                        schema = current_data()
+                        result = converter.generate_template(schema)
+                    except Exception as e:
+                        messagebox.showerror("模板生成失败", str(e))
+                        return
 
-            if result is not None:
-                formatted = json.dumps(result, indent=2, ensure_ascii=False)
-                output_text.delete("1.0", tk.END)
-                output_text.insert(tk.END, formatted)
-                highlight_json(output_text)
-                # 更新树形视图
-                tree_view.delete(*tree_view.get_children())
-                tree_view.load(result)
+                if result is not None:
+                    show_output(result)
 
-        except Exception as e:
-            messagebox.showerror("操作失败", str(e))
-        finally:
-            combo.set("请选择")  # 重置下拉菜单
+            except Exception as e:
+                messagebox.showerror("操作失败", str(e))
+            finally:
+                combo.set("请选择")  # 重置下拉菜单
 
     combo.bind("<<ComboboxSelected>>", on_action_selected)
 
@@ -445,6 +694,7 @@ def build_gui(root):
             ttk.Button(templates_frame, text=template_name, 
                       command=lambda t=template_name: apply_template(t)).pack(side=tk.LEFT, padx=5, pady=5)
         
+        @timed("增强数据")
         def apply_enhancements():
             try:
                 # 获取原始数据
@@ -453,8 +703,8 @@ def build_gui(root):
                     messagebox.showwarning("提示", "请先输入数据")
                     return
                 
-                # 解析原始数据
-                data = auto_parse(raw)
+                # 解析原始数据（输入未变化时复用会话中的结果）
+                data = current_data()
                 
                 # 解析配置
                 config_raw = config_text.get("1.0", tk.END).strip()
@@ -475,15 +725,8 @@ def build_gui(root):
                 # 应用增强
                 result = converter.enhance_data(data, enhancements)
                 
-                # 更新输出
-                formatted = json.dumps(result, indent=2, ensure_ascii=False)
-                output_text.delete("1.0", tk.END)
-                output_text.insert(tk.END, formatted)
-                highlight_json(output_text)
-                
-                # 更新树形视图
-                tree_view.delete(*tree_view.get_children())
-                tree_view.load(result)
+                # 更新输出和树形视图
+                show_output(result)
                 
                 dialog.destroy()
                 
@@ -547,8 +790,8 @@ def build_gui(root):
                     messagebox.showwarning("提示", "请先输入数据")
                     return
                 
-                # 解析数据
-                data = auto_parse(raw)
+                # 解析数据（输入未变化时复用会话中的结果）
+                data = current_data()
                 
                 # 转换为 JavaScript
                 result = converter.to_javascript(
@@ -604,6 +847,7 @@ def build_gui(root):
         steps_buttons.pack(side=tk.LEFT, fill=tk.Y, padx=5, pady=5)
 
         transforms = []  # 存储转换步骤
+        preview_result = []  # 最近一次预览的转换结果，应用时直接使用，无需重新解析
 
         def add_step():
             dialog = tk.Toplevel(parent)
@@ -718,6 +962,7 @@ def build_gui(root):
         preview_text = scrolledtext.ScrolledText(preview_frame)
         preview_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
+        @timed("数据转换预览")
         def update_preview():
             try:
                 # 获取输入数据
@@ -726,11 +971,12 @@ def build_gui(root):
                     messagebox.showwarning("提示", "请先输入数据")
                     return
                 
-                # 解析数据
-                data = auto_parse(raw)
+                # 解析数据（输入未变化时复用会话中的结果）
+                data = current_data()
                 
                 # 应用转换
                 result = converter.transform_data(data, transforms)
+                preview_result[:] = [result]
                 
                 # 更新预览
                 formatted = json.dumps(result, indent=2, ensure_ascii=False)
@@ -747,14 +993,11 @@ def build_gui(root):
         button_frame = ttk.Frame(dialog)
         button_frame.pack(fill=tk.X, padx=10, pady=10)
 
+        @timed("应用数据转换")
         def apply_transform():
-            preview_content = preview_text.get("1.0", tk.END).strip()
-            if preview_content:
-                output_text.delete("1.0", tk.END)
-                output_text.insert(tk.END, preview_content)
-                # 更新树形视图
-                tree_view.delete(*tree_view.get_children())
-                tree_view.load(json.loads(preview_content))
+            if preview_result:
+                # 更新输出和树形视图
+                show_output(preview_result[0])
                 dialog.destroy()
 
         ttk.Button(button_frame, text="应用", command=apply_transform).pack(side=tk.RIGHT, padx=5)
@@ -0,0 +1,104 @@
+import tkinter as tk
+from tkinter import messagebox, ttk
+
+from logic.comm import apply_highlight_ranges, get_monospace_font
+from logic.lexer import tokenize_highlight
+
+# 每页显示的行数
+PAGE_LINES = 1000
+
+
+class PagedViewer(tk.Toplevel):
+    """内存映射大文件的只读分页查看窗口
+
+    每次只把当前页的若干行解码后放进 Text 控件，翻页时替换内容，
+    控件里始终只有一页文本。窗口关闭时释放文件映射。
+    """
+
+    def __init__(self, master, mapped, page_lines=PAGE_LINES, on_close=None):
+        super().__init__(master)
+        self.mapped = mapped
+        self.page_lines = page_lines
+        self.first_line = 0
+        self.on_close = on_close
+        self.title(f"大文件查看（只读）- {mapped.path}")
+        self.geometry("900x700")
+
+        toolbar = ttk.Frame(self)
+        toolbar.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Button(toolbar, text="首页", command=self.first_page).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="上一页", command=self.previous_page).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="下一页", command=self.next_page).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="末页", command=self.last_page).pack(side=tk.LEFT, padx=2)
+        tk.Label(toolbar, text="跳到行：").pack(side=tk.LEFT, padx=(10, 0))
+        self.line_entry = tk.Entry(toolbar, width=10)
+        self.line_entry.pack(side=tk.LEFT)
+        self.line_entry.bind("<Return>", lambda e: self.goto_line())
+        ttk.Button(toolbar, text="跳转", command=self.goto_line).pack(side=tk.LEFT, padx=2)
+        self.status = tk.Label(toolbar, text="")
+        self.status.pack(side=tk.LEFT, padx=10)
+
+        frame = ttk.Frame(self)
+        frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
+        self.text = tk.Text(frame, wrap=tk.NONE, font=get_monospace_font(11))
+        y_scroll = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.text.yview)
+        x_scroll = ttk.Scrollbar(frame, orient=tk.HORIZONTAL, command=self.text.xview)
+        self.text.configure(yscrollcommand=y_scroll.set, xscrollcommand=x_scroll.set)
+        y_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        x_scroll.pack(side=tk.BOTTOM, fill=tk.X)
+        self.text.pack(fill=tk.BOTH, expand=True)
+
+        self.protocol("WM_DELETE_WINDOW", self.close)
+        self.show_page(0)
+
+    def show_page(self, first_line):
+        """显示从 first_line（从 0 开始）开始的一页"""
+        first_line = max(first_line, 0)
+        try:
+            content, count, truncated = self.mapped.read_lines(first_line, self.page_lines)
+        except Exception as e:
+            messagebox.showerror("读取失败", str(e), parent=self)
+            return
+        if count == 0 and first_line > 0:
+            return
+        self.first_line = first_line
+        if truncated:
+            content += "\n…（本页超过读取上限，其余内容已截断）"
+
+        self.text.config(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", content)
+        apply_highlight_ranges(self.text, tokenize_highlight(content))
+        self.text.config(state=tk.DISABLED)
+
+        status = f"第 {first_line + 1}-{first_line + count} 行"
+        if self.mapped.index_complete:
+            status += f" / 共 {self.mapped.line_count} 行"
+        self.status.config(text=status)
+
+    def first_page(self):
+        self.show_page(0)
+
+    def previous_page(self):
+        self.show_page(self.first_line - self.page_lines)
+
+    def next_page(self):
+        self.show_page(self.first_line + self.page_lines)
+
+    def last_page(self):
+        # 需要扫描完整个文件才能知道总行数
+        self.show_page(max(self.mapped.line_count - self.page_lines, 0))
+
+    def goto_line(self):
+        try:
+            line = int(self.line_entry.get().strip())
+        except ValueError:
+            messagebox.showwarning("提示", "请输入行号", parent=self)
+            return
+        self.show_page(line - 1)
+
+    def close(self):
+        if self.on_close is not None:
+            self.on_close()
+        self.mapped.close()
+        self.destroy()
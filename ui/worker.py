@@ -0,0 +1,59 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BackgroundWorker:
+    """在后台线程执行耗时任务，只把最终的界面更新交回 Tk 主线程
+
+    每次提交任务都会递增代号（generation），结果返回时如果代号已经过期
+    （期间又有新的输入），该结果会被直接丢弃。Tk 控件只能在主线程访问，
+    因此这里通过 root.after 轮询任务状态，而不是在工作线程里回调。
+    """
+
+    def __init__(self, root, poll_interval=30):
+        self.root = root
+        self.poll_interval = poll_interval
+        self.generation = 0
+        self._future = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="json-tool-worker")
+
+    def submit(self, func, on_done, *args):
+        """提交任务
+
+        Args:
+            func: 在工作线程中执行的函数，不能访问任何 Tk 控件
+            on_done: 主线程回调，签名为 on_done(result, error)
+            *args: 传给 func 的参数
+
+        Returns:
+            int: 本次任务的代号
+        """
+        generation = self.invalidate()
+        # 在提交时的上下文中运行，当前的计时操作（logic.timing）随任务一起带到工作线程
+        context = contextvars.copy_context()
+        self._future = self._executor.submit(context.run, func, *args)
+        self.root.after(self.poll_interval, self._poll, self._future, generation, on_done)
+        return generation
+
+    def invalidate(self):
+        """使尚未完成的任务结果失效，返回新的代号"""
+        self.generation += 1
+        if self._future is not None:
+            # 还在排队的任务直接取消，正在运行的任务结果会在返回时被丢弃
+            self._future.cancel()
+            self._future = None
+        return self.generation
+
+    def _poll(self, future, generation, on_done):
+        if generation != self.generation:
+            return
+        if not future.done():
+            self.root.after(self.poll_interval, self._poll, future, generation, on_done)
+            return
+        self._future = None
+        error = future.exception()
+        on_done(None if error else future.result(), error)
+
+    def shutdown(self):
+        self.invalidate()
+        self._executor.shutdown(wait=False)